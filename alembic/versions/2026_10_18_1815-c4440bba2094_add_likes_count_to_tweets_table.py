@@ -0,0 +1,65 @@
+"""add likes_count to tweets table
+
+Revision ID: c4440bba2094
+Revises: b57a0a2230ee
+Create Date: 2026-10-18 18:15:42.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4440bba2094'
+down_revision: Union[str, None] = 'b57a0a2230ee'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'tweets',
+        sa.Column('likes_count', sa.Integer(), server_default='0', nullable=False),
+    )
+
+    # keeping tweets.likes_count in sync with records of tweet_likes
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION update_tweet_likes_count() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE tweets SET likes_count = likes_count + 1 WHERE id = NEW.tweet_id;
+                RETURN NEW;
+            END IF;
+            UPDATE tweets SET likes_count = likes_count - 1 WHERE id = OLD.tweet_id;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tweet_likes_count
+        AFTER INSERT OR DELETE ON tweet_likes
+        FOR EACH ROW EXECUTE FUNCTION update_tweet_likes_count()
+        """
+    )
+
+    # backfilling existing tweets
+    op.execute(
+        """
+        UPDATE tweets SET likes_count = likes.count
+        FROM (
+            SELECT tweet_id, count(*) AS count FROM tweet_likes GROUP BY tweet_id
+        ) AS likes
+        WHERE tweets.id = likes.tweet_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS tweet_likes_count ON tweet_likes")
+    op.execute("DROP FUNCTION IF EXISTS update_tweet_likes_count()")
+    op.drop_column('tweets', 'likes_count')
@@ -0,0 +1,58 @@
+"""add indexes for lookup columns
+
+Revision ID: 7602d3567cf7
+Revises: c4440bba2094
+Create Date: 2026-10-18 18:40:11.903417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7602d3567cf7'
+down_revision: Union[str, None] = 'c4440bba2094'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # creating indexes without locking tables for writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_api_key_hash', 'users', ['api_key_hash'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_tweets_user_id_id', 'tweets', ['user_id', sa.text('id DESC')],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_user_followers_follower_id_user_id', 'user_followers',
+            ['follower_id', 'user_id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_tweet_likes_user_id', 'tweet_likes', ['user_id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_media_tweet_id', 'media', ['tweet_id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_media_tweet_id', 'media', postgresql_concurrently=True)
+        op.drop_index(
+            'ix_tweet_likes_user_id', 'tweet_likes', postgresql_concurrently=True
+        )
+        op.drop_index(
+            'ix_user_followers_follower_id_user_id', 'user_followers',
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_tweets_user_id_id', 'tweets', postgresql_concurrently=True)
+        op.drop_index('ix_users_api_key_hash', 'users', postgresql_concurrently=True)
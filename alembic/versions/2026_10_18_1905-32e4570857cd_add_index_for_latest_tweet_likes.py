@@ -0,0 +1,35 @@
+"""add index for latest tweet likes
+
+Revision ID: 32e4570857cd
+Revises: 7602d3567cf7
+Create Date: 2026-10-18 19:05:27.615830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '32e4570857cd'
+down_revision: Union[str, None] = '7602d3567cf7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # creating the index without locking the table for writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tweet_likes_tweet_id_id', 'tweet_likes',
+            ['tweet_id', sa.text('id DESC')],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tweet_likes_tweet_id_id', 'tweet_likes', postgresql_concurrently=True
+        )
@@ -0,0 +1,246 @@
+"""
+EXPLAIN ANALYZE of the queries of get_tweets, get_me and unlike_tweet
+with and without indexes of the lookup columns.
+
+The dataset is generated with a fixed seed in the separate "benchmark" schema,
+so the tables of the application aren't touched.
+
+usage: python -m benchmarks.explain_indexes [--users 2000] [--verbose]
+"""
+import argparse
+import asyncio
+import re
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import Index, event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from src import config
+from src.database.models import BaseModel
+from src.media.models import MediaModel  # noqa: F401
+from src.redis_client import redis_client
+from src.tweets.models import TweetModel
+from src.tweets.service import get_tweets, unlike_tweet
+from src.tweets.timeline import TIMELINE_KEY
+from src.users.cache import invalidate_principal
+from src.users.schemas import UserPrincipalSchema
+from src.users.service import get_me
+from src.utils import get_hash
+
+SCHEMA: str = "benchmark"
+API_KEY: str = "benchmark-user-{}"
+
+TStatements = list[tuple[str, Any]]
+
+
+async def generate_dataset(
+    connection: AsyncConnection, args: argparse.Namespace
+) -> None:
+    await connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    await connection.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    await connection.run_sync(BaseModel.metadata.create_all)
+    await connection.execute(text("ALTER TABLE tweet_likes DISABLE TRIGGER USER"))
+    await connection.execute(text("SELECT setseed(0.42)"))
+
+    statements: list[str] = [
+        # users with api keys "benchmark-user-<id>"
+        "INSERT INTO users (name, api_key_hash) "
+        "SELECT 'user ' || i, encode(sha256(('benchmark-user-' || i)::bytea), 'hex') "
+        "FROM generate_series(1, {users}) AS i",
+        # followers
+        "INSERT INTO user_followers (user_id, follower_id) "
+        "SELECT DISTINCT 1 + floor(random() * {users})::int, f "
+        "FROM generate_series(1, {users}) AS f, generate_series(1, {follows}) "
+        "ON CONFLICT DO NOTHING",
+        # tweets
+        "INSERT INTO tweets (user_id, content, create_at) "
+        "SELECT 1 + floor(random() * {users})::int, md5(i::text), "
+        "now() - i * interval '1 minute' "
+        "FROM generate_series(1, {users} * {tweets}) AS i",
+        # likes
+        "INSERT INTO tweet_likes (tweet_id, user_id) "
+        "SELECT 1 + floor(random() * {users} * {tweets})::int, "
+        "1 + floor(random() * {users})::int "
+        "FROM generate_series(1, {likes}) ON CONFLICT DO NOTHING",
+        "UPDATE tweets SET likes_count = likes.count FROM ("
+        "SELECT tweet_id, count(*) AS count FROM tweet_likes GROUP BY tweet_id"
+        ") AS likes WHERE tweets.id = likes.tweet_id",
+        # media of every third tweet
+        "INSERT INTO media (tweet_id, user_id, src) "
+        "SELECT id, user_id, md5(id::text) FROM tweets WHERE id % 3 = 0",
+    ]
+    parameters: dict = {
+        "users": args.users,
+        "follows": args.follows,
+        "tweets": args.tweets,
+        "likes": args.likes,
+    }
+    for i_statement in statements:
+        await connection.execute(text(i_statement.format(**parameters)))
+
+    await connection.execute(text("ALTER TABLE tweet_likes ENABLE TRIGGER USER"))
+    await connection.execute(text("ANALYZE"))
+
+
+async def capture_statements(
+    connection: AsyncConnection, call: Callable[[AsyncSession], Awaitable[Any]]
+) -> TStatements:
+    """
+    Getting SQL statements of the service call, changes are rolled back.
+    """
+    statements: TStatements = list()
+
+    def before_cursor_execute(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        statements.append((statement, parameters))
+
+    transaction = await connection.begin()
+    session = AsyncSession(bind=connection, join_transaction_mode="create_savepoint")
+    event.listen(
+        connection.sync_connection, "before_cursor_execute", before_cursor_execute
+    )
+    try:
+        await call(session)
+    finally:
+        event.remove(
+            connection.sync_connection, "before_cursor_execute", before_cursor_execute
+        )
+        await session.close()
+        await transaction.rollback()
+
+    return [
+        i_statement
+        for i_statement in statements
+        if not i_statement[0].startswith(("SAVEPOINT", "RELEASE", "ROLLBACK"))
+    ]
+
+
+async def explain(
+    connection: AsyncConnection, statements: TStatements, verbose: bool
+) -> float:
+    """
+    EXPLAIN ANALYZE of statements, changes are rolled back.
+    :return: total execution time in milliseconds
+    """
+    total: float = 0
+    transaction = await connection.begin()
+    try:
+        for i_statement, i_parameters in statements:
+            result = await connection.exec_driver_sql(
+                "EXPLAIN (ANALYZE, BUFFERS) " + i_statement, i_parameters
+            )
+            plan: list[str] = [i_row[0] for i_row in result.fetchall()]
+            match = re.search(r"Execution Time: ([\d.]+) ms", plan[-1])
+            total += float(match.group(1)) if match else 0
+            if verbose:
+                print(i_statement, i_parameters, *plan, sep="\n", end="\n\n")
+    finally:
+        await transaction.rollback()
+
+    return total
+
+
+async def get_scenarios(
+    connection: AsyncConnection,
+) -> dict[str, Callable[[AsyncSession], Awaitable[Any]]]:
+    # the user who follows the largest number of people
+    result = await connection.execute(
+        text(
+            "SELECT follower_id FROM user_followers "
+            "GROUP BY follower_id ORDER BY count(*) DESC LIMIT 1"
+        )
+    )
+    user_id: int = result.scalar_one()
+
+    # the like of this user
+    result = await connection.execute(
+        text("SELECT tweet_id FROM tweet_likes WHERE user_id = :id LIMIT 1"),
+        {"id": user_id},
+    )
+    tweet_id: int = result.scalar_one()
+    await connection.rollback()
+
+    api_key: str = API_KEY.format(user_id)
+    user = UserPrincipalSchema(id=user_id, name=f"user {user_id}")
+
+    async def _get_tweets(session: AsyncSession) -> None:
+        # without caches for getting all queries of the service
+        await invalidate_principal(get_hash(api_key))
+        await redis_client.delete(TIMELINE_KEY.format(user_id))
+        await get_tweets(session=session, api_key=api_key, limit=20, offset=5)
+
+    async def _get_me(session: AsyncSession) -> None:
+        await get_me(session=session, api_key=api_key)
+
+    async def _unlike_tweet(session: AsyncSession) -> None:
+        tweet: TweetModel = await session.get_one(TweetModel, tweet_id)
+        await unlike_tweet(session=session, tweet=tweet, user=user)
+
+    return {"get_tweets": _get_tweets, "get_me": _get_me, "unlike_tweet": _unlike_tweet}
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(
+        args.db_url, connect_args={"server_settings": {"search_path": SCHEMA}}
+    )
+    async with engine.begin() as connection:
+        print("generating dataset...")
+        await generate_dataset(connection=connection, args=args)
+
+    indexes: list[Index] = [
+        i_index
+        for i_table in BaseModel.metadata.sorted_tables
+        for i_index in i_table.indexes
+    ]
+
+    async with engine.connect() as connection:
+        scenarios = await get_scenarios(connection=connection)
+        statements: dict[str, TStatements] = {
+            i_name: await capture_statements(connection=connection, call=i_call)
+            for i_name, i_call in scenarios.items()
+        }
+
+        # dropping all indexes for the baseline
+        async with connection.begin():
+            for i_index in indexes:
+                await connection.run_sync(i_index.drop)
+
+        results: dict[str, dict[str, float]] = dict()
+        steps: list[tuple[str, Index | None]] = [("without indexes", None)]
+        steps.extend((f"+ {i_index.name}", i_index) for i_index in indexes)
+
+        for i_step, i_index in steps:
+            if i_index is not None:
+                async with connection.begin():
+                    await connection.run_sync(i_index.create)
+                    await connection.execute(text("ANALYZE"))
+
+            results[i_step] = {
+                i_name: await explain(
+                    connection=connection, statements=i_statements, verbose=args.verbose
+                )
+                for i_name, i_statements in statements.items()
+            }
+
+    await engine.dispose()
+
+    print(f"{'execution time, ms':<45}" + "".join(f"{i:>15}" for i in scenarios))
+    for i_step, i_times in results.items():
+        print(f"{i_step:<45}" + "".join(f"{i:>15.3f}" for i in i_times.values()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", default=config.DB_URL_TEST)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--follows", type=int, default=200, help="per user")
+    parser.add_argument("--tweets", type=int, default=50, help="per user")
+    parser.add_argument("--likes", type=int, default=200000)
+    parser.add_argument("--verbose", action="store_true", help="print query plans")
+    asyncio.run(main(parser.parse_args()))
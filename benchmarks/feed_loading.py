@@ -0,0 +1,154 @@
+"""
+Rows fetched and wall time of the page of the feed with joined loading
+of author, likes and media (the previous loader) and with the loader
+of get_tweets (one query per relation).
+
+The dataset is generated in the separate "benchmark" schema,
+so the tables of the application aren't touched.
+
+usage: python -m benchmarks.feed_loading [--likes 500] [--media 4] [--repeat 20]
+"""
+import argparse
+import asyncio
+import time
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from benchmarks.explain_indexes import API_KEY, SCHEMA, capture_statements
+from src import config
+from src.database.models import BaseModel
+from src.media.models import MediaModel
+from src.redis_client import redis_client
+from src.tweets import service as tweets_service
+from src.tweets.models import TweetModel
+from src.tweets.timeline import TIMELINE_KEY
+from src.users.models import UserModel
+
+USER_ID: int = 1
+
+JOINED_LOADER_OPTIONS: tuple[LoaderOption, ...] = (
+    joinedload(TweetModel.author).load_only(UserModel.id, UserModel.name),
+    joinedload(TweetModel.likes).load_only(UserModel.id, UserModel.name),
+    joinedload(TweetModel.media).load_only(MediaModel.src),
+)
+
+
+async def generate_dataset(
+    connection: AsyncConnection, args: argparse.Namespace
+) -> None:
+    await connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    await connection.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    await connection.run_sync(BaseModel.metadata.create_all)
+
+    statements: list[str] = [
+        # the author of the feed and users who like every tweet
+        "INSERT INTO users (name, api_key_hash) "
+        "SELECT 'user ' || i, encode(sha256(('benchmark-user-' || i)::bytea), 'hex') "
+        "FROM generate_series(1, greatest({likes}, 1)) AS i",
+        "INSERT INTO tweets (user_id, content, create_at) "
+        "SELECT 1, md5(i::text), now() FROM generate_series(1, {limit}) AS i",
+        "INSERT INTO tweet_likes (tweet_id, user_id) "
+        "SELECT t, u FROM generate_series(1, {limit}) AS t, "
+        "generate_series(1, {likes}) AS u",
+        "INSERT INTO media (tweet_id, user_id, src) "
+        "SELECT t, 1, md5((t * {media} + m)::text) "
+        "FROM generate_series(1, {limit}) AS t, generate_series(1, {media}) AS m",
+    ]
+    parameters: dict = {"likes": args.likes, "media": args.media, "limit": args.limit}
+    for i_statement in statements:
+        await connection.execute(text(i_statement.format(**parameters)))
+
+    await connection.execute(text("ANALYZE"))
+
+
+async def count_rows(
+    connection: AsyncConnection, statements: list[tuple[str, Any]]
+) -> int:
+    """
+    Getting the number of rows returned by statements, changes are rolled back.
+    """
+    rows: int = 0
+    transaction = await connection.begin()
+    try:
+        for i_statement, i_parameters in statements:
+            result = await connection.exec_driver_sql(i_statement, i_parameters)
+            rows += len(result.fetchall()) if result.returns_rows else 0
+    finally:
+        await transaction.rollback()
+
+    return rows
+
+
+async def get_page(session: AsyncSession, limit: int) -> None:
+    tweets = await tweets_service.get_tweets(
+        session=session, api_key=API_KEY.format(USER_ID), limit=limit, offset=1
+    )
+    assert len(tweets) == limit
+    session.expunge_all()
+
+
+async def measure(
+    connection: AsyncConnection, args: argparse.Namespace
+) -> tuple[int, int, float]:
+    """
+    :return: number of queries, rows fetched and wall time of the page in ms
+    """
+    statements = await capture_statements(
+        connection=connection, call=lambda session: get_page(session, args.limit)
+    )
+    rows: int = await count_rows(connection=connection, statements=statements)
+
+    session = AsyncSession(bind=connection, expire_on_commit=False)
+    try:
+        # warming up caches of the user and the timeline
+        await get_page(session, args.limit)
+
+        started_at: float = time.perf_counter()
+        for _ in range(args.repeat):
+            await get_page(session, args.limit)
+        elapsed: float = (time.perf_counter() - started_at) * 1000 / args.repeat
+    finally:
+        await session.close()
+
+    return len(statements), rows, elapsed
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(
+        args.db_url, connect_args={"server_settings": {"search_path": SCHEMA}}
+    )
+    async with engine.begin() as connection:
+        print("generating dataset...")
+        await generate_dataset(connection=connection, args=args)
+
+    loaders: dict[str, tuple[LoaderOption, ...]] = {
+        "joinedload": JOINED_LOADER_OPTIONS,
+        "get_tweets": tweets_service.FEED_LOADER_OPTIONS,
+    }
+    results: dict[str, tuple[int, int, float]] = dict()
+    async with engine.connect() as connection:
+        for i_name, i_options in loaders.items():
+            await redis_client.delete(TIMELINE_KEY.format(USER_ID))
+            tweets_service.FEED_LOADER_OPTIONS = i_options
+            results[i_name] = await measure(connection=connection, args=args)
+
+    await redis_client.delete(TIMELINE_KEY.format(USER_ID))
+    await engine.dispose()
+
+    print(f"{'loader':<15}{'queries':>10}{'rows':>12}{'ms per page':>15}")
+    for i_name, (i_queries, i_rows, i_time) in results.items():
+        print(f"{i_name:<15}{i_queries:>10}{i_rows:>12}{i_time:>15.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", default=config.DB_URL_TEST)
+    parser.add_argument("--limit", type=int, default=20, help="tweets per page")
+    parser.add_argument("--likes", type=int, default=500, help="per tweet")
+    parser.add_argument("--media", type=int, default=4, help="per tweet")
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,101 @@
+"""
+Serialization time of the page of the feed (20 tweets of ORM objects)
+by the FastAPI response_model path with json and orjson responses
+and by the one-pass path of trusted response models.
+
+The database isn't used, ORM objects are created in memory.
+
+usage: python -m benchmarks.response_serialization [--likes 3] [--repeat 2000]
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from fastapi.routing import APIRoute, serialize_response
+
+from src.main import application
+from src.tweets.models import TweetModel
+from src.tweets.schemas import SuccessTweetsResponseSchema
+from src.users.models import UserModel
+from src.users.schemas import UserPrincipalSchema
+from src.utils import get_trusted_response
+
+FEED_PATH: str = "/api/tweets/"
+
+
+def get_content(args: argparse.Namespace) -> dict:
+    author: UserModel = UserModel(id=1, name="author", api_key_hash="")
+    tweets: list[TweetModel] = list()
+    for i_id in range(args.limit, 0, -1):
+        i_tweet: TweetModel = TweetModel(
+            id=i_id, user_id=author.id, content="tweet " * 20, likes_count=args.likes
+        )
+        i_tweet.author = author
+        i_tweet.attachments = [f"https://storage/images/{i_id}.jpg"] * args.media
+        i_tweet.likes_preview = [
+            UserPrincipalSchema(id=i_user, name=f"user {i_user}")
+            for i_user in range(args.likes)
+        ]
+        tweets.append(i_tweet)
+
+    return {"result": True, "tweets": tweets, "next_cursor": "MQ=="}
+
+
+async def main(args: argparse.Namespace) -> None:
+    route: APIRoute = next(
+        i_route
+        for i_route in application.routes
+        if isinstance(i_route, APIRoute)
+        and i_route.path == FEED_PATH
+        and "GET" in i_route.methods
+    )
+    content: dict = get_content(args)
+
+    async def fastapi_json() -> Response:
+        return JSONResponse(
+            await serialize_response(
+                field=route.response_field, response_content=content
+            )
+        )
+
+    async def fastapi_orjson() -> Response:
+        return ORJSONResponse(
+            await serialize_response(
+                field=route.response_field, response_content=content
+            )
+        )
+
+    async def trusted() -> Response:
+        return get_trusted_response(
+            response_model=SuccessTweetsResponseSchema, content=content
+        )
+
+    paths: dict[str, Callable[[], Awaitable[Any]]] = {
+        "response_model + json": fastapi_json,
+        "response_model + orjson": fastapi_orjson,
+        "trusted response model": trusted,
+    }
+
+    # all paths return the same JSON
+    bodies: list[Any] = [(await i_path()).body for i_path in paths.values()]
+    assert len(set(bodies)) == 1
+    print(f"response size: {len(bodies[0])} bytes")
+
+    print(f"{'path':<30}{'us per page':>15}")
+    for i_name, i_path in paths.items():
+        started_at: float = time.perf_counter()
+        for _ in range(args.repeat):
+            await i_path()
+        elapsed: float = (time.perf_counter() - started_at) * 10**6 / args.repeat
+        print(f"{i_name:<30}{elapsed:>15.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--limit", type=int, default=20, help="tweets per page")
+    parser.add_argument("--likes", type=int, default=3, help="likers per tweet")
+    parser.add_argument("--media", type=int, default=4, help="per tweet")
+    parser.add_argument("--repeat", type=int, default=2000)
+    asyncio.run(main(parser.parse_args()))
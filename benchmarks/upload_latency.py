@@ -0,0 +1,196 @@
+"""
+Latency of the feed while large images are uploaded concurrently,
+with the previous upload handler (reading the whole file on the event loop
+and sending bytes to celery) and with uploads streamed to the spool.
+
+The application is started by uvicorn in a separate thread, requests are sent
+over HTTP. The dataset is generated in the separate "benchmark" schema.
+Celery tasks are not processed, they are purged from the broker at the end.
+
+usage: python -m benchmarks.upload_latency [--uploads 4] [--size 15]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import threading
+import time
+from typing import AsyncGenerator
+
+import httpx
+import uvicorn
+from fastapi import Depends, File, UploadFile
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.explain_indexes import API_KEY, SCHEMA
+from src import config
+from src.celery_init import celery_app
+from src.database.core import get_session
+from src.database.models import BaseModel
+from src.main import application
+from src.media import config as media_config
+from src.media.config import LOADING_IMAGE_SRC
+from src.media.service import add_image_media
+from src.users.service import check_and_get_user_by_api_key
+from src.utils import api_key_param, get_hash
+
+USER_ID: int = 1
+
+
+async def legacy_add_media(
+    api_key: str = Depends(api_key_param),
+    file: UploadFile = File(...),
+    session: AsyncSession = Depends(get_session),
+) -> dict:
+    """
+    The upload handler before streaming to the spool
+    """
+    user = await check_and_get_user_by_api_key(api_key=api_key, session=session)
+    image_id: int = await add_image_media(
+        session=session, user=user, image_src=LOADING_IMAGE_SRC
+    )
+    celery_app.send_task(
+        "src.media.tasks.load_image",
+        kwargs={"image_id": image_id, "image_data": file.file.read()},
+    )
+    return {"result": True, "media_id": image_id}
+
+
+async def generate_dataset(db_url: str) -> None:
+    engine = create_async_engine(
+        db_url, connect_args={"server_settings": {"search_path": SCHEMA}}
+    )
+    async with engine.begin() as connection:
+        await connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await connection.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await connection.run_sync(BaseModel.metadata.create_all)
+        await connection.execute(
+            text("INSERT INTO users (name, api_key_hash) VALUES ('user 1', :hash)"),
+            {"hash": get_hash(API_KEY.format(USER_ID))},
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO tweets (user_id, content, create_at) "
+                "SELECT 1, md5(i::text), now() FROM generate_series(1, 50) AS i"
+            )
+        )
+    await engine.dispose()
+
+
+def start_server(args: argparse.Namespace) -> uvicorn.Server:
+    engine = create_async_engine(
+        args.db_url, connect_args={"server_settings": {"search_path": SCHEMA}}
+    )
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async def get_benchmark_session() -> AsyncGenerator[AsyncSession, None]:
+        async with session_maker() as session:
+            yield session
+
+    application.dependency_overrides[get_session] = get_benchmark_session
+    application.add_api_route(
+        "/api/medias/legacy", legacy_add_media, methods=["POST"], status_code=201
+    )
+
+    server = uvicorn.Server(
+        uvicorn.Config(application, port=args.port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.1)
+    return server
+
+
+async def probe_feed(
+    client: httpx.AsyncClient, done: asyncio.Event, latencies: list[float]
+) -> None:
+    while not done.is_set():
+        started_at: float = time.perf_counter()
+        response = await client.get(
+            "/api/tweets/",
+            headers={"Api-Key": API_KEY.format(USER_ID)},
+            params={"limit": 10},
+        )
+        assert response.status_code == 200
+        latencies.append((time.perf_counter() - started_at) * 1000)
+        await asyncio.sleep(0.01)
+
+
+async def upload(client: httpx.AsyncClient, path: str, data: bytes) -> None:
+    response = await client.post(
+        path, headers={"Api-Key": API_KEY.format(USER_ID)}, files={"file": data}
+    )
+    assert response.status_code == 201, response.text
+
+
+async def run_mode(
+    client: httpx.AsyncClient, path: str | None, args: argparse.Namespace
+) -> tuple[list[float], float]:
+    """
+    :return: latencies of the feed in ms and the time of all uploads in seconds
+    """
+    done: asyncio.Event = asyncio.Event()
+    latencies: list[float] = list()
+    probe = asyncio.create_task(probe_feed(client, done, latencies))
+
+    started_at: float = time.perf_counter()
+    if path is None:
+        await asyncio.sleep(args.baseline)
+    else:
+        data: bytes = os.urandom(args.size * 1024 * 1024)
+        await asyncio.gather(*[upload(client, path, data) for _ in range(args.uploads)])
+    elapsed: float = time.perf_counter() - started_at
+
+    done.set()
+    await probe
+    return latencies, elapsed
+
+
+async def main(args: argparse.Namespace) -> None:
+    # logging of every request distorts latencies
+    logger.remove()
+    await generate_dataset(args.db_url)
+
+    spool_dir = tempfile.TemporaryDirectory()
+    media_config.MEDIA_SPOOL_PATH = spool_dir.name
+    media_config.MEDIA_MAX_SIZE = (args.size + 1) * 1024 * 1024
+    server = start_server(args)
+
+    modes: dict[str, str | None] = {
+        "without uploads": None,
+        "read on the event loop": "/api/medias/legacy",
+        "streaming to the spool": "/api/medias/",
+    }
+    print(f"{args.uploads} concurrent uploads of {args.size} MiB")
+    print(
+        f"{'mode':<25}{'feed p50, ms':>15}{'feed p95, ms':>15}"
+        f"{'feed max, ms':>15}{'uploads, s':>12}"
+    )
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{args.port}", timeout=None
+    ) as client:
+        for i_name, i_path in modes.items():
+            i_latencies, i_elapsed = await run_mode(client, i_path, args)
+            i_percentiles: list[float] = statistics.quantiles(i_latencies, n=20)
+            print(
+                f"{i_name:<25}{statistics.median(i_latencies):>15.1f}"
+                f"{i_percentiles[-1]:>15.1f}{max(i_latencies):>15.1f}"
+                f"{i_elapsed:>12.2f}"
+            )
+
+    server.should_exit = True
+    celery_app.control.purge()
+    spool_dir.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", default=config.DB_URL_TEST)
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--uploads", type=int, default=4, help="concurrent uploads")
+    parser.add_argument("--size", type=int, default=15, help="MiB per upload")
+    parser.add_argument("--baseline", type=float, default=2, help="seconds")
+    asyncio.run(main(parser.parse_args()))
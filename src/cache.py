@@ -0,0 +1,106 @@
+import json
+from typing import Any
+
+from fastapi import Response
+from fastapi_cache import FastAPICache
+from loguru import logger
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+
+from src import config
+from src.redis_client import redis_client
+from src.utils import dump_trusted_response, get_hash
+
+# the version of the tag is a part of keys of responses which depend on it,
+# incrementing the version makes all these responses unreachable
+CACHE_VERSION_KEY: str = "cache-version:{}"
+
+
+async def get_response_cache_key(
+    namespace: str, api_key: str, tags: list[str], **params: Any
+) -> str | None:
+    """
+    getting the key of the cached response for the user
+    :param namespace: name of the endpoint
+    :param api_key: API key of the user who requests
+    :param tags: tags of the data which the response depends on
+    :param params: query parameters of the request
+    :return: key of the response or None if the cache is unavailable
+    """
+    try:
+        versions: list[str | None] = await redis_client.mget(
+            [CACHE_VERSION_KEY.format(i_tag) for i_tag in tags]
+        )
+    except RedisError as exc:
+        logger.warning(f"getting versions of the cache failed: {exc}")
+        return None
+
+    key_data: str = json.dumps(
+        {"params": params, "versions": dict(zip(tags, versions))}, sort_keys=True
+    )
+    return "{}:{}:{}:{}".format(
+        FastAPICache.get_prefix(), namespace, get_hash(api_key), get_hash(key_data)
+    )
+
+
+async def get_cached_response(key: str | None) -> Response | None:
+    """
+    getting the cached response
+    :param key: key of the response
+    :return: response with JSON or None if the response is not cached
+    """
+    if key is None:
+        return None
+
+    try:
+        content: str | None = await FastAPICache.get_backend().get(key)
+    except RedisError as exc:
+        logger.warning(f"getting the response from the cache failed: {exc}")
+        return None
+
+    if content is None:
+        return None
+    return Response(content=content, media_type="application/json")
+
+
+async def cache_response(
+    key: str | None, response_model: type[BaseModel], content: dict
+) -> Response:
+    """
+    serializing the response by the response model and saving it to the cache
+    :param key: key of the response
+    :param response_model: response model of the endpoint
+    :param content: data of the response
+    :return: response with JSON
+    """
+    response_json: str = dump_trusted_response(
+        response_model=response_model, content=content
+    )
+
+    if key is not None:
+        try:
+            await FastAPICache.get_backend().set(
+                key, response_json, expire=config.RESPONSE_CACHE_TTL
+            )
+        except RedisError as exc:
+            logger.warning(f"saving the response to the cache failed: {exc}")
+
+    return Response(content=response_json, media_type="application/json")
+
+
+async def invalidate_cache(*tags: str) -> None:
+    """
+    making cached responses which depend on tags outdated
+    :param tags: tags of the changed data
+    :return: None
+    """
+    if not tags:
+        return
+
+    try:
+        async with redis_client.pipeline(transaction=False) as pipeline:
+            for i_tag in tags:
+                pipeline.incr(CACHE_VERSION_KEY.format(i_tag))
+            await pipeline.execute()
+    except RedisError as exc:
+        logger.warning(f"invalidating the cache failed: {exc}")
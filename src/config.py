@@ -11,6 +11,9 @@ STATIC_FILES_PATH: str = os.getenv("FASTAPI_STATIC_FILES_PATH", "static")
 
 SENTRY_DNS: str = os.getenv("SENTRY_DNS", "")
 
+# lifetime of cached responses in seconds, they are also invalidated on writes
+RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", 60))
+
 YANDEX_S3_ACCESS_KEY_ID: str = os.getenv("YANDEX_S3_ACCESS_KEY_ID", "")
 YANDEX_S3_SECRET_ACCESS_KEY: str = os.getenv("YANDEX_S3_SECRET_ACCESS_KEY", "")
 YANDEX_S3_ENDPOINT: str = os.getenv("YANDEX_S3_ENDPOINT", "")
@@ -27,3 +27,8 @@ class ConflictError(APIException):
 class AccessError(APIException):
     def __init__(self, message: str, *args: Any) -> None:
         super().__init__("AccessError", message, *args)
+
+
+class SizeError(APIException):
+    def __init__(self, message: str, *args: Any) -> None:
+        super().__init__("SizeError", message, *args)
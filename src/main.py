@@ -1,18 +1,21 @@
+import asyncio
 from datetime import datetime
 
 import sentry_sdk
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
 from loguru import logger
 from prometheus_fastapi_instrumentator import Instrumentator
-from redis import asyncio as aioredis
 
 from src import config
 from src.database.core import engine, shutdown_db
 from src.database.models import BaseModel
+from src.media.blobs import watch_blob_store
 from src.media.router import router as media_router
+from src.redis_client import redis_client, shutdown_redis
 from src.tweets.router import router as tweets_router
 from src.users.router import router as users_router
 
@@ -43,6 +46,7 @@ application: FastAPI = FastAPI(
     title="Twitter clone",
     version="0.1.0",
     description="Thesis by Andrey Telitsin for Skillbox",
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -77,10 +81,14 @@ async def startup() -> None:
     logger.debug("starting...")
     metrics_instrument.expose(application)
 
-    redis_url = config.REDIS_URL_TEST if config.TESTING else config.REDIS_URL
-    redis = aioredis.from_url(redis_url, encoding="utf8", decode_responses=True)
-    FastAPICache.init(RedisBackend(redis), prefix="fastapi-cache")
+    FastAPICache.init(RedisBackend(redis_client), prefix="fastapi-cache")
+
+    # the reference is kept for cancelling the task on shutdown
+    application.state.blob_store_watcher = asyncio.create_task(watch_blob_store())
+
 
 @application.on_event("shutdown")
 async def _on_shutdown() -> None:
+    application.state.blob_store_watcher.cancel()
     await shutdown_db()
+    await shutdown_redis()
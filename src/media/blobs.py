@@ -0,0 +1,356 @@
+import asyncio
+import io
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import AsyncGenerator, BinaryIO
+
+import anyio
+from fastapi import UploadFile
+from loguru import logger
+from prometheus_client import Gauge
+from redis.exceptions import RedisError
+
+from src.exceptions import SizeError
+from src.media import config as media_config
+from src.redis_client import redis_blob_client, redis_client
+from src.utils import get_unique_filename
+
+# chunks of the blob are entries of the stream
+BLOB_STREAM_KEY: str = "media-blob:{}"
+# sizes of blobs in the redis store by names
+BLOB_SIZES_KEY: str = "media-blob-sizes"
+# references of blobs handed off to celery tasks, they don't expire
+BLOB_PENDING_KEY: str = "media-blob-pending"
+# the worker of the application which cleans blob stores
+BLOB_WATCHER_KEY: str = "media-blob-watcher"
+
+blob_store_size: Gauge = Gauge(
+    "media_blob_store_size_bytes",
+    "Size of uploaded files waiting for processing",
+    ["store"],
+)
+blob_store_blobs: Gauge = Gauge(
+    "media_blob_store_blobs",
+    "Number of uploaded files waiting for processing",
+    ["store"],
+)
+
+
+async def read_upload(file: UploadFile) -> AsyncGenerator[bytes, None]:
+    """
+    reading the uploaded file by chunks with the limit of the size
+    :param file: uploaded file
+    :return: chunks of the file
+    """
+    max_size: int = media_config.MEDIA_MAX_SIZE
+    error_message: str = f"the file must be equal to or less than {max_size} bytes."
+
+    # the size is known from the request before reading
+    if file.size is not None and file.size > max_size:
+        raise SizeError(error_message)
+
+    size: int = 0
+    while chunk := await file.read(media_config.MEDIA_CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_size:
+            raise SizeError(error_message)
+        yield chunk
+
+
+class BlobStore(ABC):
+    """
+    Storage of uploaded files for handing off to celery tasks,
+    tasks receive the small reference instead of the content
+    """
+
+    name: str
+
+    def get_reference(self, blob_name: str) -> str:
+        return f"{self.name}:{blob_name}"
+
+    @abstractmethod
+    async def put(self, file: UploadFile) -> str:
+        """
+        saving the uploaded file by chunks
+        :param file: uploaded file
+        :return: reference of the blob
+        """
+
+    async def hand_off(self, blob_name: str) -> None:
+        """
+        marking the blob as pending for the celery task,
+        pending blobs aren't deleted by cleaning however long the queue is
+        :param blob_name: name of the blob from the reference
+        :return: None
+        """
+        await redis_client.sadd(BLOB_PENDING_KEY, self.get_reference(blob_name))
+
+    @abstractmethod
+    async def open(self, blob_name: str) -> BinaryIO:
+        """
+        opening the blob for reading
+        :param blob_name: name of the blob from the reference
+        :return: file object of the blob
+        """
+
+    async def delete(self, blob_name: str) -> None:
+        """
+        deleting the consumed blob
+        :param blob_name: name of the blob from the reference
+        :return: None
+        """
+        await self._delete(blob_name)
+        await redis_client.srem(BLOB_PENDING_KEY, self.get_reference(blob_name))
+
+    @abstractmethod
+    async def _delete(self, blob_name: str) -> None:
+        pass
+
+    @abstractmethod
+    async def clean(self) -> tuple[int, int]:
+        """
+        deleting expired blobs which were never handed off to tasks,
+        e.g. interrupted uploads
+        :return: size in bytes and number of remaining blobs
+        """
+
+
+class FileSystemBlobStore(BlobStore):
+    """
+    Blobs are files in the spool directory shared by the application and workers
+    """
+
+    name: str = "fs"
+
+    @staticmethod
+    def get_path(blob_name: str) -> str:
+        return os.path.join(media_config.MEDIA_SPOOL_PATH, blob_name)
+
+    async def put(self, file: UploadFile) -> str:
+        await anyio.Path(media_config.MEDIA_SPOOL_PATH).mkdir(
+            parents=True, exist_ok=True
+        )
+        blob_name: str = get_unique_filename()
+        path = anyio.Path(self.get_path(blob_name))
+
+        try:
+            async with await anyio.open_file(path, "wb") as blob_file:
+                async for i_chunk in read_upload(file):
+                    await blob_file.write(i_chunk)
+        except BaseException:
+            await path.unlink(missing_ok=True)
+            raise
+
+        return self.get_reference(blob_name)
+
+    async def open(self, blob_name: str) -> BinaryIO:
+        return open(self.get_path(blob_name), "rb")
+
+    async def _delete(self, blob_name: str) -> None:
+        try:
+            os.remove(self.get_path(blob_name))
+        except FileNotFoundError:
+            logger.warning(f"the blob {blob_name} doesn't exist")
+
+    async def clean(self) -> tuple[int, int]:
+        pending: set[str] = await redis_client.smembers(BLOB_PENDING_KEY)
+        return await anyio.to_thread.run_sync(self._clean, pending)
+
+    def _clean(self, pending: set[str]) -> tuple[int, int]:
+        expired_at: float = time.time() - media_config.MEDIA_BLOB_TTL
+        size: int = 0
+        count: int = 0
+
+        try:
+            entries: list[os.DirEntry] = list(os.scandir(media_config.MEDIA_SPOOL_PATH))
+        except FileNotFoundError:
+            return size, count
+
+        for i_entry in entries:
+            try:
+                i_stat: os.stat_result = i_entry.stat()
+                if (
+                    i_stat.st_mtime < expired_at
+                    and self.get_reference(i_entry.name) not in pending
+                ):
+                    logger.warning(f"removing the expired blob {i_entry.name}")
+                    os.remove(i_entry.path)
+                    continue
+            except FileNotFoundError:
+                # the blob was consumed while scanning
+                continue
+            size += i_stat.st_size
+            count += 1
+
+        return size, count
+
+
+class RedisBlobStore(BlobStore):
+    """
+    Blobs are streams of chunks in Redis with the lifetime,
+    workers don't need the shared directory
+    """
+
+    name: str = "redis"
+
+    async def put(self, file: UploadFile) -> str:
+        blob_name: str = get_unique_filename()
+        key: str = BLOB_STREAM_KEY.format(blob_name)
+
+        size: int = 0
+        try:
+            async for i_chunk in read_upload(file):
+                size += len(i_chunk)
+                async with redis_blob_client.pipeline(transaction=False) as pipeline:
+                    pipeline.xadd(key, {"data": i_chunk})
+                    # the blob expires if the upload is interrupted
+                    pipeline.expire(key, media_config.MEDIA_BLOB_TTL)
+                    await pipeline.execute()
+
+            await redis_blob_client.hset(BLOB_SIZES_KEY, blob_name, size)
+        except BaseException:
+            await redis_blob_client.delete(key)
+            raise
+
+        return self.get_reference(blob_name)
+
+    async def open(self, blob_name: str) -> BinaryIO:
+        entries: list = await redis_blob_client.xrange(
+            BLOB_STREAM_KEY.format(blob_name)
+        )
+        if not entries:
+            raise FileNotFoundError(f"the blob {blob_name} doesn't exist")
+
+        return io.BytesIO(b"".join(i_fields[b"data"] for _, i_fields in entries))
+
+    async def hand_off(self, blob_name: str) -> None:
+        await super().hand_off(blob_name)
+        # the lifetime only protects from interrupted uploads
+        await redis_blob_client.persist(BLOB_STREAM_KEY.format(blob_name))
+
+    async def _delete(self, blob_name: str) -> None:
+        async with redis_blob_client.pipeline(transaction=False) as pipeline:
+            pipeline.delete(BLOB_STREAM_KEY.format(blob_name))
+            pipeline.hdel(BLOB_SIZES_KEY, blob_name)
+            await pipeline.execute()
+
+    async def clean(self) -> tuple[int, int]:
+        sizes: dict[bytes, bytes] = await redis_blob_client.hgetall(BLOB_SIZES_KEY)
+        blob_names: list[bytes] = list(sizes)
+
+        async with redis_blob_client.pipeline(transaction=False) as pipeline:
+            for i_blob_name in blob_names:
+                pipeline.exists(BLOB_STREAM_KEY.format(i_blob_name.decode()))
+            exist: list[int] = await pipeline.execute()
+
+        # streams of expired blobs are deleted by Redis
+        expired: list[bytes] = [
+            i_blob_name
+            for i_blob_name, i_exists in zip(blob_names, exist)
+            if not i_exists
+        ]
+        if expired:
+            await redis_blob_client.hdel(BLOB_SIZES_KEY, *expired)
+
+        size: int = sum(
+            int(sizes[i_blob_name])
+            for i_blob_name, i_exists in zip(blob_names, exist)
+            if i_exists
+        )
+        return size, len(blob_names) - len(expired)
+
+
+blob_stores: dict[str, BlobStore] = {
+    i_store.name: i_store for i_store in (FileSystemBlobStore(), RedisBlobStore())
+}
+
+
+def get_blob_store(reference: str | None = None) -> BlobStore:
+    """
+    getting the store of the blob or the configured store for new blobs
+    :param reference: reference of the blob
+    :return: blob store
+    """
+    if reference is None:
+        return blob_stores[media_config.MEDIA_BLOB_STORE]
+    return blob_stores[reference.split(":", 1)[0]]
+
+
+async def put_blob(file: UploadFile) -> str:
+    """
+    saving the uploaded file to the configured blob store
+    :param file: uploaded file
+    :return: reference of the blob for the celery task
+    """
+    return await get_blob_store().put(file=file)
+
+
+async def open_blob(reference: str) -> BinaryIO:
+    """
+    opening the blob by the reference
+    :param reference: reference of the blob
+    :return: file object of the blob
+    """
+    return await get_blob_store(reference).open(reference.split(":", 1)[1])
+
+
+async def hand_off_blob(reference: str) -> None:
+    """
+    marking the blob as pending for the celery task
+    :param reference: reference of the blob
+    :return: None
+    """
+    await get_blob_store(reference).hand_off(reference.split(":", 1)[1])
+
+
+async def delete_blob(reference: str) -> None:
+    """
+    deleting the consumed blob by the reference
+    :param reference: reference of the blob
+    :return: None
+    """
+    await get_blob_store(reference).delete(reference.split(":", 1)[1])
+
+
+async def acquire_blob_watcher(token: str) -> bool:
+    """
+    electing the only worker of the application which cleans the blob store,
+    the worker keeps the role while it is alive
+    :param token: unique token of the worker
+    :return: whether the worker is the watcher
+    """
+    lifetime: int = media_config.MEDIA_BLOB_WATCH_INTERVAL * 2
+    if await redis_client.set(BLOB_WATCHER_KEY, token, nx=True, ex=lifetime):
+        return True
+
+    if await redis_client.get(BLOB_WATCHER_KEY) == token:
+        await redis_client.expire(BLOB_WATCHER_KEY, lifetime)
+        return True
+
+    return False
+
+
+async def watch_blob_store() -> None:
+    """
+    deleting expired blobs and updating metrics of the size of the store
+    in the elected worker of the application
+    :return: None
+    """
+    token: str = uuid.uuid4().hex
+    while True:
+        blob_store: BlobStore = get_blob_store()
+        try:
+            if await acquire_blob_watcher(token):
+                size, count = await blob_store.clean()
+                blob_store_size.labels(store=blob_store.name).set(size)
+                blob_store_blobs.labels(store=blob_store.name).set(count)
+            else:
+                # metrics are reported only by the watcher
+                blob_store_size.clear()
+                blob_store_blobs.clear()
+        except (OSError, RedisError) as exc:
+            logger.warning(f"cleaning the blob store failed: {exc}")
+
+        await asyncio.sleep(media_config.MEDIA_BLOB_WATCH_INTERVAL)
@@ -10,3 +10,17 @@ LOADING_IMAGE_SRC: str = os.getenv(
 
 YANDEX_S3_BUCKET_NAME: str = os.getenv("YANDEX_S3_BUCKET_NAME", "")
 YANDEX_S3_IMAGES_URL: str = os.getenv("YANDEX_S3_IMAGES_URL", "")
+
+# directory for uploaded files waiting for processing,
+# it must be shared by the application and celery workers
+MEDIA_SPOOL_PATH: str = os.getenv("MEDIA_SPOOL_PATH", "../spool")
+# the maximum size of the uploaded file in bytes
+MEDIA_MAX_SIZE: int = int(os.getenv("MEDIA_MAX_SIZE", 20 * 1024 * 1024))
+# the size of the chunk read from the uploaded file
+MEDIA_CHUNK_SIZE: int = int(os.getenv("MEDIA_CHUNK_SIZE", 1024 * 1024))
+# storage of uploaded files for celery tasks: "fs" (the spool directory) or "redis"
+MEDIA_BLOB_STORE: str = os.getenv("MEDIA_BLOB_STORE", "fs")
+# the lifetime of blobs which were never consumed by tasks in seconds
+MEDIA_BLOB_TTL: int = int(os.getenv("MEDIA_BLOB_TTL", 3600))
+# the interval of cleaning the blob store and updating its metrics in seconds
+MEDIA_BLOB_WATCH_INTERVAL: int = int(os.getenv("MEDIA_BLOB_WATCH_INTERVAL", 60))
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Integer
+from sqlalchemy import ForeignKey, Index, Integer
 from sqlalchemy.orm import Mapped, MappedColumn
 
 from src.database.models import BaseModel
@@ -6,6 +6,7 @@ from src.database.models import BaseModel
 
 class MediaModel(BaseModel):
     __tablename__ = "media"
+    __table_args__ = (Index("ix_media_tweet_id", "tweet_id"),)
     tweet_id: Mapped[int] = MappedColumn(
         Integer(), ForeignKey("tweets.id"), nullable=True
     )
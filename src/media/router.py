@@ -4,12 +4,13 @@ from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.core import get_session
-from src.exceptions import ExistError
+from src.exceptions import ExistError, SizeError
+from src.media.blobs import delete_blob, hand_off_blob, put_blob
 from src.media.config import LOADING_IMAGE_SRC
 from src.media.schemas import SuccessMediaResponseSchema
 from src.media.service import add_image_media
 from src.media.tasks import load_image
-from src.users.models import UserModel
+from src.users.schemas import UserPrincipalSchema
 from src.users.service import check_and_get_user_by_api_key
 from src.utils import api_key_param, return_server_exception, return_user_exception
 
@@ -34,25 +35,36 @@ async def _add_media(
     try:
         logger.info("getting the user by api key")
         await logger.complete()
-        user: UserModel = await check_and_get_user_by_api_key(
+        user: UserPrincipalSchema = await check_and_get_user_by_api_key(
             api_key=api_key,
             session=session,
             error_message="The user who wants to add image media doesn't exist",
         )
 
-        logger.info("adding image to the database")
+        logger.info("saving image to the blob store")
         await logger.complete()
-        image_id: int = await add_image_media(
-            session=session, user=user, image_src=LOADING_IMAGE_SRC
-        )
+        image_reference: str = await put_blob(file=file)
 
-        logger.info("creating the process of the image")
+        logger.info("adding image to the database")
         await logger.complete()
-        load_image.delay(image_id=image_id, image_data=file.file.read())
+        try:
+            image_id: int = await add_image_media(
+                session=session, user=user, image_src=LOADING_IMAGE_SRC
+            )
+
+            logger.info("creating the process of the image")
+            await logger.complete()
+            await hand_off_blob(image_reference)
+            load_image.delay(image_id=image_id, image_reference=image_reference)
+        except Exception:
+            await delete_blob(image_reference)
+            raise
 
         return {"result": True, "media_id": image_id}
 
     except ExistError as exc:
         return await return_user_exception(exception=exc)
+    except SizeError as exc:
+        return await return_user_exception(exception=exc, status_code=413)
     except Exception as exc:
         return await return_server_exception(exception=exc)
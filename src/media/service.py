@@ -1,12 +1,14 @@
-from sqlalchemy import Update, update
+from sqlalchemy import Row, Update, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.dml import ReturningUpdate
 
 from src.media.models import MediaModel
-from src.users.models import UserModel
+from src.tweets.cache import invalidate_feeds
+from src.users.schemas import UserPrincipalSchema
 
 
 async def add_image_media(
-    session: AsyncSession, user: UserModel, image_src: str
+    session: AsyncSession, user: UserPrincipalSchema, image_src: str
 ) -> int:
     """
     The service for adding image media to the database.
@@ -24,7 +26,10 @@ async def add_image_media(
 
 
 async def update_tweet_id(
-    session: AsyncSession, tweet_id: int, user: UserModel, media_ids: list[int]
+    session: AsyncSession,
+    tweet_id: int,
+    user: UserPrincipalSchema,
+    media_ids: list[int],
 ) -> None:
     """
     The service for updating the twitter_id column
@@ -46,6 +51,9 @@ async def update_tweet_id(
     await session.execute(statement)
     await session.commit()
 
+    # attachments are changed in feeds with the tweet
+    await invalidate_feeds(session=session, author_id=user.id)
+
 
 async def update_image_src(
     session: AsyncSession, image_id: int, image_src: str
@@ -61,8 +69,15 @@ async def update_image_src(
     :return: None
     """
     # update image src
-    statement: Update = (
-        update(MediaModel).where(MediaModel.id == image_id).values(src=image_src)
+    statement: ReturningUpdate = (
+        update(MediaModel)
+        .where(MediaModel.id == image_id)
+        .values(src=image_src)
+        .returning(MediaModel.tweet_id, MediaModel.user_id)
     )
-    await session.execute(statement)
+    image: Row | None = (await session.execute(statement)).first()
     await session.commit()
+
+    # attachments are changed in feeds with the tweet
+    if image and image.tweet_id:
+        await invalidate_feeds(session=session, author_id=image.user_id)
@@ -1,6 +1,6 @@
 import io
 from asyncio import get_event_loop
-from typing import AnyStr
+from typing import AnyStr, BinaryIO
 
 import PIL
 from botocore.client import BaseClient
@@ -10,6 +10,7 @@ from PIL import Image
 from src import config
 from src.celery_init import celery_app, scoped_session
 from src.media import config as media_config
+from src.media.blobs import delete_blob, open_blob
 from src.media.service import update_image_src
 from src.utils import get_unique_filename
 from src.yandex_s3 import session as s3_session
@@ -18,16 +19,21 @@ loop = get_event_loop()
 
 
 @celery_app.task
-def load_image(image_id: int, image_data: AnyStr) -> None:
+def load_image(image_id: int, image_reference: str) -> None:
     """
     task for load image to the storage and update src in the database
     :param image_id: the image record id.
-    :param image_data: data of the images
+    :param image_reference: reference of the image in the blob store
     :return: None
     """
     logger.info("optimizing image")
     # optimizing image
-    image, filetype = process_image(image_data=image_data)
+    try:
+        with loop.run_until_complete(open_blob(image_reference)) as image_file:
+            image, filetype = process_image(image_file=image_file)
+    finally:
+        # the consumed blob isn't needed for retries of storing
+        loop.run_until_complete(delete_blob(image_reference))
 
     logger.info("sending image to storage")
     # sending image to storage
@@ -44,14 +50,14 @@ def load_image(image_id: int, image_data: AnyStr) -> None:
     )
 
 
-def process_image(image_data: AnyStr) -> tuple[bytes, str]:
+def process_image(image_file: BinaryIO) -> tuple[bytes, str]:
     """
     optimization images
-    :param image_data: data of the image
+    :param image_file: file object of the image
     :return: optimized image data and image type
     """
-    # loading an image data to PIL Image
-    image = Image.open(io.BytesIO(image_data))  # type: ignore
+    # loading an image file to PIL Image
+    image = Image.open(image_file)
     filetype: str = image.format
 
     # changing an image size
@@ -0,0 +1,16 @@
+from redis import asyncio as aioredis
+
+from src import config
+
+REDIS_URL: str = config.REDIS_URL_TEST if config.TESTING else config.REDIS_URL
+
+redis_client: aioredis.Redis = aioredis.from_url(
+    REDIS_URL, encoding="utf8", decode_responses=True
+)
+# the client for binary data, responses aren't decoded
+redis_blob_client: aioredis.Redis = aioredis.from_url(REDIS_URL)
+
+
+async def shutdown_redis() -> None:
+    await redis_client.close()
+    await redis_blob_client.close()
@@ -0,0 +1,20 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache import invalidate_cache
+from src.tweets.timeline import get_follower_ids
+
+# cached feeds of the user
+FEED_TAG: str = "feed:{}"
+
+
+async def invalidate_feeds(session: AsyncSession, author_id: int) -> None:
+    """
+    making cached feeds of the author and his followers outdated
+    :param session: session to connect to the database
+    :param author_id: id of the author whose tweets are changed
+    :return: None
+    """
+    follower_ids = await get_follower_ids(session=session, user_id=author_id)
+    await invalidate_cache(
+        *[FEED_TAG.format(i_id) for i_id in (author_id, *follower_ids)]
+    )
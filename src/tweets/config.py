@@ -0,0 +1,16 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# the maximum number of tweet ids kept in the home timeline of one user
+TIMELINE_MAX_LENGTH: int = int(os.getenv("TIMELINE_MAX_LENGTH", 1000))
+# lifetime of the home timeline in seconds, after that it is rebuilt from database
+TIMELINE_TTL: int = int(os.getenv("TIMELINE_TTL", 24 * 60 * 60))
+# authors with more followers are not fanned out on write
+TIMELINE_FANOUT_LIMIT: int = int(os.getenv("TIMELINE_FANOUT_LIMIT", 10000))
+# the number of timelines updated by one redis command
+TIMELINE_FANOUT_BATCH_SIZE: int = int(os.getenv("TIMELINE_FANOUT_BATCH_SIZE", 500))
+# the number of the latest likers returned with every tweet of the feed
+LIKES_PREVIEW_SIZE: int = int(os.getenv("LIKES_PREVIEW_SIZE", 3))
@@ -1,6 +1,16 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, UniqueConstraint, func
+from sqlalchemy import (
+    DDL,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    UniqueConstraint,
+    event,
+    func,
+    text,
+)
 from sqlalchemy.orm import Mapped, MappedColumn, relationship
 
 from src.database.models import BaseModel
@@ -16,17 +26,19 @@ class TweetModel(BaseModel):
     )
     content: Mapped[str]
     create_at: Mapped[datetime] = MappedColumn(DateTime, default=func.now())
+    # maintained by the tweet_likes trigger
+    likes_count: Mapped[int] = MappedColumn(Integer(), default=0, server_default="0")
 
     media: Mapped[list[MediaModel]] = relationship(
         argument=MediaModel,
         primaryjoin="TweetModel.id == MediaModel.tweet_id",
-        lazy="joined",
+        lazy="selectin",
     )
 
     author: Mapped[UserModel] = relationship(
         argument="UserModel",
         primaryjoin="TweetModel.user_id == UserModel.id",
-        lazy="joined",
+        lazy="selectin",
     )
 
     likes: Mapped[list[UserModel]] = relationship(
@@ -34,14 +46,23 @@ class TweetModel(BaseModel):
         secondary="tweet_likes",
         primaryjoin="TweetModel.id == TweetLikeModel.tweet_id",
         secondaryjoin="TweetLikeModel.user_id == UserModel.id",
-        lazy="joined",
+        # the number of likes is unbounded, they are got by pages
+        lazy="raise",
+        passive_deletes=True,
     )
 
 
+# the latest tweets of the author
+Index("ix_tweets_user_id_id", TweetModel.user_id, TweetModel.id.desc())
+
+
 class TweetLikeModel(BaseModel):
     __tablename__ = "tweet_likes"
     __table_args__ = (
         UniqueConstraint("tweet_id", "user_id", name="unique_tweet_like_id"),
+        Index("ix_tweet_likes_user_id", "user_id"),
+        # the latest likes of the tweet
+        Index("ix_tweet_likes_tweet_id_id", "tweet_id", text("id DESC")),
     )
     tweet_id: Mapped[int] = MappedColumn(
         Integer(), ForeignKey("tweets.id", ondelete="CASCADE")
@@ -49,3 +70,31 @@ class TweetLikeModel(BaseModel):
     user_id: Mapped[int] = MappedColumn(
         Integer(), ForeignKey("users.id", ondelete="CASCADE")
     )
+
+
+# keeping tweets.likes_count in sync with records of tweet_likes
+LIKES_COUNT_FUNCTION: DDL = DDL(
+    """
+    CREATE OR REPLACE FUNCTION update_tweet_likes_count() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE tweets SET likes_count = likes_count + 1 WHERE id = NEW.tweet_id;
+            RETURN NEW;
+        END IF;
+        UPDATE tweets SET likes_count = likes_count - 1 WHERE id = OLD.tweet_id;
+        RETURN OLD;
+    END;
+    $$ LANGUAGE plpgsql
+    """
+)
+
+LIKES_COUNT_TRIGGER: DDL = DDL(
+    """
+    CREATE TRIGGER tweet_likes_count
+    AFTER INSERT OR DELETE ON tweet_likes
+    FOR EACH ROW EXECUTE FUNCTION update_tweet_likes_count()
+    """
+)
+
+event.listen(TweetLikeModel.__table__, "after_create", LIKES_COUNT_FUNCTION)
+event.listen(TweetLikeModel.__table__, "after_create", LIKES_COUNT_TRIGGER)
@@ -1,15 +1,18 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from fastapi.responses import JSONResponse
 from loguru import logger
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache import cache_response, get_cached_response, get_response_cache_key
 from src.database.core import get_session
 from src.exceptions import AccessError, ConflictError, ExistError
 from src.media.service import update_tweet_id
 from src.schemas import SuccessResponseSchema
+from src.tweets.cache import FEED_TAG
 from src.tweets.models import TweetModel
 from src.tweets.schemas import (
+    SuccessTweetLikesResponseSchema,
     SuccessTweetPostResponseSchema,
     SuccessTweetsResponseSchema,
     TweetSchema,
@@ -18,14 +21,18 @@ from src.tweets.service import (
     add_tweet,
     check_and_get_tweet,
     delete_tweet,
+    get_tweet_likes,
     get_tweets,
     like_tweet,
     unlike_tweet,
 )
-from src.users.models import UserModel
+from src.users.schemas import UserPrincipalSchema
 from src.users.service import check_and_get_user_by_api_key
 from src.utils import (
     api_key_param,
+    decode_cursor,
+    encode_cursor,
+    get_trusted_response,
     return_custom_exception,
     return_server_exception,
     return_user_exception,
@@ -49,7 +56,7 @@ async def _add_tweet(
     try:
         logger.info("getting the user by api key")
         await logger.complete()
-        user: UserModel = await check_and_get_user_by_api_key(
+        user: UserPrincipalSchema = await check_and_get_user_by_api_key(
             api_key=api_key,
             session=session,
             error_message="The user who wants to add the tweet doesn't exist",
@@ -92,7 +99,7 @@ async def _delete_tweet(
     try:
         logger.info("getting the user by api key")
         await logger.complete()
-        user: UserModel = await check_and_get_user_by_api_key(
+        user: UserPrincipalSchema = await check_and_get_user_by_api_key(
             api_key=api_key,
             session=session,
             error_message="The user who wants to delete the tweet doesn't exist",
@@ -107,37 +114,163 @@ async def _delete_tweet(
         return await return_server_exception(exception=exc)
 
 
+def _check_pagination(
+    limit: int | None, offset: int | None, cursor: str | None
+) -> int | None:
+    """
+    Checking pagination parameters of getting tweets
+    :param limit: limit of getting tweets
+    :param offset: offset before getting tweets
+    :param cursor: next_cursor from the previous page
+    :return: id of the last tweet of the previous page
+    """
+    # Checking limit and offset
+    if type(limit) is int and limit <= 0:
+        raise ValueError("the limit must be greater than 0.")
+    elif type(limit) is int and limit > 20:
+        raise ValueError("the limit must be equal to or less than 20.")
+
+    if type(offset) is int and offset <= 0:
+        raise ValueError("the offset must be greater than 0.")
+
+    # Checking cursor
+    if cursor is None:
+        return None
+
+    if offset is not None:
+        raise ValueError("the cursor can't be used with the offset.")
+
+    return decode_cursor(cursor)
+
+
 @router.get("/", response_model=SuccessTweetsResponseSchema, status_code=200)
 async def _get_tweets(
     limit: int | None = None,
     offset: int | None = None,
+    cursor: str | None = None,
     api_key: str = Depends(api_key_param),
     session: AsyncSession = Depends(get_session),
-) -> dict | JSONResponse:
+) -> Response | JSONResponse:
     """
     The endpoint for getting tweets
     :param limit: limit of getting tweets
     :param offset: offset before getting tweets
+    :param cursor: next_cursor from the previous page
     :param api_key: API key of the user who wants to add the tweet
-    :return: id of tweet in database
+    :return: tweets and the cursor of the next page
     """
     try:
-        # Checking limit and offset
-        if type(limit) is int and limit <= 0:
-            raise ValueError("the limit must be greater than 0.")
-        elif type(limit) is int and limit > 20:
-            raise ValueError("the limit must be equal to or less than 20.")
+        last_tweet_id: int | None = _check_pagination(
+            limit=limit, offset=offset, cursor=cursor
+        )
 
-        if type(offset) is int and offset <= 0:
-            raise ValueError("the offset must be greater than 0.")
+        logger.info("getting the user by api key")
+        await logger.complete()
+        user: UserPrincipalSchema = await check_and_get_user_by_api_key(
+            api_key=api_key,
+            session=session,
+            error_message="The user who wants to retrieve tweets doesn't exist",
+        )
+
+        logger.info("getting tweets from the cache")
+        await logger.complete()
+        cache_key: str | None = await get_response_cache_key(
+            namespace="tweets",
+            api_key=api_key,
+            tags=[FEED_TAG.format(user.id)],
+            limit=limit,
+            offset=offset,
+            cursor=last_tweet_id,
+        )
+        cached_response: Response | None = await get_cached_response(cache_key)
+        if cached_response:
+            return cached_response
 
         logger.info("getting tweets")
         await logger.complete()
         tweets = await get_tweets(
-            session=session, api_key=api_key, limit=limit, offset=offset
+            session=session,
+            api_key=api_key,
+            limit=limit,
+            offset=offset,
+            cursor=last_tweet_id,
+        )
+
+        # the full page means that there can be older tweets
+        next_cursor: str | None = None
+        if limit and len(tweets) == limit:
+            next_cursor = encode_cursor(min(i_tweet.id for i_tweet in tweets))
+
+        return await cache_response(
+            key=cache_key,
+            response_model=SuccessTweetsResponseSchema,
+            content={"result": True, "tweets": tweets, "next_cursor": next_cursor},
+        )
+
+    except ExistError as exc:
+        return await return_user_exception(exception=exc)
+    except ValueError as exc:
+        return await return_custom_exception(
+            exception=exc,
+            message=exc.__str__(),
+            error_type="ValueError",
         )
+    except Exception as exc:
+        return await return_server_exception(exception=exc)
+
 
-        return {"result": True, "tweets": tweets}
+@router.get(
+    "/{tweet_id}/likes", response_model=SuccessTweetLikesResponseSchema, status_code=200
+)
+async def _get_tweet_likes(
+    tweet_id: int,
+    limit: int | None = None,
+    offset: int | None = None,
+    cursor: str | None = None,
+    api_key: str = Depends(api_key_param),
+    session: AsyncSession = Depends(get_session),
+) -> Response | JSONResponse:
+    """
+    The endpoint for getting users who liked the tweet by id.
+    :param tweet_id: id of the tweet
+    :param limit: limit of getting users
+    :param offset: offset before getting users
+    :param cursor: next_cursor from the previous page
+    :param api_key: API key of the user who wants to get likes
+    :return: users from the latest like and the cursor of the next page
+    """
+    try:
+        last_like_id: int | None = _check_pagination(
+            limit=limit, offset=offset, cursor=cursor
+        )
+
+        logger.info("getting user by api key")
+        await logger.complete()
+        await check_and_get_user_by_api_key(session=session, api_key=api_key)
+
+        logger.info("getting tweet by id")
+        await logger.complete()
+        await check_and_get_tweet(session=session, tweet_id=tweet_id)
+
+        logger.info("getting likes of the tweet")
+        await logger.complete()
+        likes = await get_tweet_likes(
+            session=session,
+            tweet_id=tweet_id,
+            limit=limit,
+            offset=offset,
+            cursor=last_like_id,
+        )
+
+        # the full page means that there can be older likes
+        next_cursor: str | None = None
+        if limit and len(likes) == limit:
+            next_cursor = encode_cursor(min(i_like.like_id for i_like in likes))
+
+        return get_trusted_response(
+            response_model=SuccessTweetLikesResponseSchema,
+            content={"result": True, "likes": likes, "next_cursor": next_cursor},
+        )
 
     except ExistError as exc:
         return await return_user_exception(exception=exc)
@@ -165,7 +298,7 @@ async def _like_tweet(
     try:
         logger.info("getting user by api key")
         await logger.complete()
-        user: UserModel = await check_and_get_user_by_api_key(
+        user: UserPrincipalSchema = await check_and_get_user_by_api_key(
             session=session, api_key=api_key
         )
 
@@ -210,7 +343,7 @@ async def _unlike_tweet(
     try:
         logger.info("getting user by api key")
         await logger.complete()
-        user: UserModel = await check_and_get_user_by_api_key(
+        user: UserPrincipalSchema = await check_and_get_user_by_api_key(
             session=session, api_key=api_key
         )
 
@@ -24,8 +24,16 @@ class SuccessTweetGetResponseSchema(BaseModel):
     content: str
     attachments: list[str]
     author: UserSchema
-    likes: list[TweetUserLikeSchema]
+    likes_count: int
+    # only the latest users who liked the tweet, all of them are got by pages
+    likes: list[TweetUserLikeSchema] = Field(validation_alias="likes_preview")
 
 
 class SuccessTweetsResponseSchema(SuccessResponseSchema):
     tweets: list[SuccessTweetGetResponseSchema]
+    next_cursor: Optional[str] = None
+
+
+class SuccessTweetLikesResponseSchema(SuccessResponseSchema):
+    likes: list[TweetUserLikeSchema]
+    next_cursor: Optional[str] = None
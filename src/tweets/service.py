@@ -1,24 +1,38 @@
+from collections import defaultdict
 from typing import Sequence
 
 from sqlalchemy import (
+    ColumnElement,
     Delete,
+    Row,
     ScalarResult,
     Select,
     Subquery,
     delete,
-    desc,
-    func,
     or_,
     select,
+    true,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlalchemy.sql.selectable import LateralFromClause
 
 from src.exceptions import AccessError, ExistError
 from src.media.models import MediaModel
+from src.tweets import config as tweets_config
+from src.tweets.cache import invalidate_feeds
 from src.tweets.models import TweetLikeModel, TweetModel
-from src.users.models import UserModel
-from src.utils import get_hash
+from src.tweets.timeline import get_timeline, push_tweet, retract_tweet
+from src.users.models import UserFollowerModel, UserModel
+from src.users.schemas import UserPrincipalSchema
+from src.users.service import get_user_by_api_key
+
+# relations of the feed are loaded by one query per relation for the whole page
+FEED_LOADER_OPTIONS: tuple[LoaderOption, ...] = (
+    selectinload(TweetModel.author).load_only(UserModel.id, UserModel.name),
+    selectinload(TweetModel.media).load_only(MediaModel.src),
+)
 
 
 async def get_tweet(session: AsyncSession, tweet_id: int) -> TweetModel:
@@ -47,84 +61,78 @@ async def get_tweets(
     api_key: str,
     limit: int | None,
     offset: int | None,
+    cursor: int | None = None,
 ) -> list[TweetModel] | Sequence[TweetModel]:
     """
-    The service for adding tweet in database
+    The service for getting tweets of the user and people he follows
     :param session: session to connect to the database.
-    :param api_key: API key of the user who wants to add the tweet
+    :param api_key: API key of the user who wants to get tweets
     :param limit: limiting the number of tweets to receive
-    :param offset: number of posts to skip
-    :return: id of the tweet in database
+    :param offset: number of the page
+    :param cursor: id of the last tweet of the previous page
+    :return: tweets from the latest, sorted by the number of likes within the page
     """
     # Getting user
-    user_query: Select = (
-        select(UserModel)
-        .where(UserModel.api_key_hash == get_hash(api_key))
-        .options(joinedload(UserModel.following))
+    user: UserPrincipalSchema | None = await get_user_by_api_key(
+        api_key=api_key, session=session
     )
-    user: UserModel = await session.scalar(user_query)
 
     # Checking the existence of a user
     if not user:
         raise ExistError("The user who wants to retrieve tweets doesn't exist")
+    user_id: int = user.id
 
-    # getting user following ids
-    user_following_ids: list[int] = [i_following.id for i_following in user.following]
-
-    # Subquery for getting tweets
-    tweets_subquery: Subquery = (
-        select(TweetModel.content, TweetModel.id.label("id"))
-        # adding author
-        .options(joinedload(TweetModel.author).load_only(UserModel.id, UserModel.name))
-        # adding likes
-        .options(joinedload(TweetModel.likes).load_only(UserModel.id, UserModel.name))
-        # adding media
-        .options(joinedload(TweetModel.media).load_only(MediaModel.src))
-        # sorting for getting the latest tweets
-        .order_by(TweetModel.id.desc())
-        # filtering to get only your tweets or tweets from people you follow
-        .where(
-            or_(
-                TweetModel.user_id == user.id,
-                TweetModel.user_id.in_(user_following_ids),
-            )
-        )
-        # offset and limit tweets
-        .subquery()
+    # getting the precomputed home timeline
+    timeline_ids: list[int] | None = await get_timeline(
+        session=session, user_id=user_id, limit=limit, offset=offset, cursor=cursor
     )
 
-    subquery: Subquery
-    if limit and offset:
-        subquery = (
-            select(tweets_subquery)
-            .offset(offset=(offset - 1) * limit)
-            .limit(limit=limit)
-            .subquery()
+    condition: ColumnElement[bool]
+    if timeline_ids is None:
+        # filtering to get only your tweets or tweets from people you follow
+        following_query: Select = select(UserFollowerModel.user_id).where(
+            UserFollowerModel.follower_id == user_id
+        )
+        condition = or_(
+            TweetModel.user_id == user_id,
+            TweetModel.user_id.in_(following_query),
         )
     else:
-        subquery = tweets_subquery
+        # filtering to get only tweets from the timeline page
+        condition = TweetModel.id.in_(timeline_ids)
 
-    # Subquery for getting count of likes
-    likes_count_subquery: Subquery = (
-        select(
-            TweetModel.id.label("tweet_id"),
-            func.count(TweetLikeModel.id).label("likes_count"),
-        )
-        .outerjoin(TweetLikeModel)
-        .join(subquery, TweetModel.id == subquery.c.id)
-        .group_by(TweetModel.id)
-        .subquery("likes_count_subquery")
+    # Query for getting tweets
+    tweets_query: Select = (
+        select(TweetModel.id.label("id"))
+        # sorting for getting the latest tweets
+        .order_by(TweetModel.id.desc())
+        # filtering tweets
+        .where(condition)
     )
 
+    # the page of the timeline is already sliced in redis
+    if timeline_ids is None:
+        # getting only tweets older than the last tweet of the previous page
+        if cursor:
+            tweets_query = tweets_query.where(TweetModel.id < cursor)
+
+        # offset and limit tweets
+        if limit:
+            tweets_query = tweets_query.limit(limit=limit)
+        if limit and offset:
+            tweets_query = tweets_query.offset(offset=(offset - 1) * limit)
+
+    subquery: Subquery = tweets_query.subquery()
+
     # Query for getting tweets and order by likes
     query: Select = (
         select(TweetModel)
         # adding tweets
         .join(subquery, subquery.c.id == TweetModel.id)
-        # adding the number of likes for sorting
-        .join(likes_count_subquery, TweetModel.id == likes_count_subquery.c.tweet_id)
+        # adding author, likes and media
+        .options(*FEED_LOADER_OPTIONS)
         # sorting by number of likes. from most to least.
-        .order_by(desc(likes_count_subquery.c.likes_count))
+        .order_by(TweetModel.likes_count.desc())
         # sorting by create datetime.
         .order_by(TweetModel.create_at.desc())
     )
@@ -133,14 +141,99 @@ async def get_tweets(
     tweets_response: ScalarResult = await session.scalars(query)
     tweets: Sequence = tweets_response.unique().fetchall()
 
+    # getting the latest likers of every tweet
+    likes_preview: dict[int, list[Row]] = await get_likes_preview(
+        session=session, tweet_ids=[i_tweet.id for i_tweet in tweets]
+    )
+
     # # create attachments for every post
     for i_tweet in tweets:
         i_tweet.attachments = [i_media.src for i_media in i_tweet.media]
+        i_tweet.likes_preview = likes_preview[i_tweet.id]
 
     return tweets
 
 
-async def add_tweet(session: AsyncSession, user: UserModel, tweet_content: str) -> int:
+async def get_likes_preview(
+    session: AsyncSession,
+    tweet_ids: list[int],
+    size: int = tweets_config.LIKES_PREVIEW_SIZE,
+) -> dict[int, list[Row]]:
+    """
+    The service for getting the latest users who liked every tweet
+    :param session: session to connect to the database.
+    :param tweet_ids: ids of tweets
+    :param size: the maximum number of users for one tweet
+    :return: users (id and name) by tweet id, from the latest like
+    """
+    likes_preview: dict[int, list[Row]] = defaultdict(list)
+    if not tweet_ids or size <= 0:
+        return likes_preview
+
+    # the latest likes of one tweet by the index, without reading all likes
+    likes_query: LateralFromClause = (
+        select(TweetLikeModel.id, TweetLikeModel.user_id)
+        .where(TweetLikeModel.tweet_id == TweetModel.id)
+        .order_by(TweetLikeModel.id.desc())
+        .limit(size)
+        .lateral()
+    )
+
+    query: Select = (
+        select(TweetModel.id.label("tweet_id"), UserModel.id, UserModel.name)
+        .select_from(TweetModel)
+        .join(likes_query, true())
+        .join(UserModel, UserModel.id == likes_query.c.user_id)
+        .where(TweetModel.id.in_(tweet_ids))
+        .order_by(likes_query.c.id.desc())
+    )
+
+    for i_row in await session.execute(query):
+        likes_preview[i_row.tweet_id].append(i_row)
+
+    return likes_preview
+
+
+async def get_tweet_likes(
+    session: AsyncSession,
+    tweet_id: int,
+    limit: int | None,
+    offset: int | None,
+    cursor: int | None = None,
+) -> Sequence[Row]:
+    """
+    The service for getting users who liked the tweet
+    :param session: session to connect to the database.
+    :param tweet_id: id of the tweet
+    :param limit: limiting the number of users to receive
+    :param offset: number of the page
+    :param cursor: id of the last like of the previous page
+    :return: users (id, name and like_id) from the latest like
+    """
+    query: Select = (
+        select(TweetLikeModel.id.label("like_id"), UserModel.id, UserModel.name)
+        .join(UserModel, UserModel.id == TweetLikeModel.user_id)
+        .where(TweetLikeModel.tweet_id == tweet_id)
+        .order_by(TweetLikeModel.id.desc())
+    )
+
+    # getting only likes older than the last like of the previous page
+    if cursor:
+        query = query.where(TweetLikeModel.id < cursor)
+
+    # offset and limit likes
+    if limit:
+        query = query.limit(limit=limit)
+    if limit and offset:
+        query = query.offset(offset=(offset - 1) * limit)
+
+    result = await session.execute(query)
+    return result.fetchall()
+
+
+async def add_tweet(
+    session: AsyncSession, user: UserPrincipalSchema, tweet_content: str
+) -> int:
     """
     The service for adding tweet in database
     :param session: session to connect to the database.
@@ -154,10 +247,16 @@ async def add_tweet(session: AsyncSession, user: UserModel, tweet_content: str)
     session.add(instance)
     await session.commit()
 
+    # Adding tweet to timelines of the user and his followers
+    await push_tweet(session=session, tweet_id=instance.id, author_id=user.id)
+    await invalidate_feeds(session=session, author_id=user.id)
+
     return instance.id
 
 
-async def delete_tweet(session: AsyncSession, tweet_id: int, user: UserModel) -> None:
+async def delete_tweet(
+    session: AsyncSession, tweet_id: int, user: UserPrincipalSchema
+) -> None:
     """
     The service for adding tweet in database
     :param session: session to connect to the database.
@@ -181,8 +280,14 @@ async def delete_tweet(session: AsyncSession, tweet_id: int, user: UserModel) ->
     await session.delete(tweet)
     await session.commit()
 
+    # Removing tweet from timelines
+    await retract_tweet(session=session, tweet_id=tweet_id, author_id=user.id)
+    await invalidate_feeds(session=session, author_id=user.id)
+
 
-async def like_tweet(session: AsyncSession, tweet: TweetModel, user: UserModel) -> None:
+async def like_tweet(
+    session: AsyncSession, tweet: TweetModel, user: UserPrincipalSchema
+) -> None:
     """
     The service for liking the tweet by id
     :param session: session to connect to the database
@@ -195,9 +300,12 @@ async def like_tweet(session: AsyncSession, tweet: TweetModel, user: UserModel)
     session.add(instance)
     await session.commit()
 
+    # the number of likes is changed in feeds with the tweet
+    await invalidate_feeds(session=session, author_id=tweet.user_id)
+
 
 async def unlike_tweet(
-    session: AsyncSession, tweet: TweetModel, user: UserModel
+    session: AsyncSession, tweet: TweetModel, user: UserPrincipalSchema
 ) -> None:
     """
     The service for unliking the tweet by id
@@ -215,3 +323,6 @@ async def unlike_tweet(
 
     await session.execute(statement)
     await session.commit()
+
+    # the number of likes is changed in feeds with the tweet
+    await invalidate_feeds(session=session, author_id=tweet.user_id)
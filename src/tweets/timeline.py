@@ -0,0 +1,270 @@
+from typing import Sequence
+
+from loguru import logger
+from redis.exceptions import RedisError
+from sqlalchemy import Select, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.redis_client import redis_client
+from src.tweets import config as tweets_config
+from src.tweets.models import TweetModel
+from src.users.models import UserFollowerModel
+
+TIMELINE_KEY: str = "timeline:{}"
+CELEBRITIES_KEY: str = "timeline:celebrities"
+# the member that keeps an empty timeline in redis, real tweet ids start from 1
+EMPTY_TIMELINE_MEMBER: str = "0"
+
+# adding tweet ids (ARGV[2:]) only to existing timelines (KEYS),
+# missing timelines are cold and will be built from the database on reading
+_PUSH_SCRIPT = redis_client.register_script(
+    """
+    local max_length = tonumber(ARGV[1])
+    for _, key in ipairs(KEYS) do
+        if redis.call("EXISTS", key) == 1 then
+            for i = 2, #ARGV do
+                redis.call("ZADD", key, ARGV[i], ARGV[i])
+            end
+            redis.call("ZREMRANGEBYRANK", key, 0, -max_length - 1)
+        end
+    end
+    return 0
+    """
+)
+
+
+def _get_batches(keys: list[str]) -> list[list[str]]:
+    size: int = tweets_config.TIMELINE_FANOUT_BATCH_SIZE
+    batches: list[list[str]] = list()
+    for i_start in range(0, len(keys), size):
+        i_end: int = i_start + size
+        batches.append(keys[i_start:i_end])
+    return batches
+
+
+async def get_follower_ids(session: AsyncSession, user_id: int) -> Sequence[int]:
+    """
+    The service for getting ids of the user followers
+    :param session: session to connect to the database
+    :param user_id: id of the user whose followers you want to get
+    :return: ids of the followers
+    """
+    query: Select = select(UserFollowerModel.follower_id).where(
+        UserFollowerModel.user_id == user_id
+    )
+    return (await session.scalars(query)).all()
+
+
+async def get_author_tweet_ids(session: AsyncSession, author_id: int) -> Sequence[int]:
+    """
+    The service for getting ids of the latest tweets of the author
+    :param session: session to connect to the database
+    :param author_id: id of the author
+    :return: ids of the tweets which can be in a timeline
+    """
+    query: Select = (
+        select(TweetModel.id)
+        .where(TweetModel.user_id == author_id)
+        .order_by(TweetModel.id.desc())
+        .limit(tweets_config.TIMELINE_MAX_LENGTH)
+    )
+    return (await session.scalars(query)).all()
+
+
+async def build_timeline(session: AsyncSession, user_id: int) -> list[int]:
+    """
+    The service for building the home timeline of the user from the database
+    :param session: session to connect to the database
+    :param user_id: id of the timeline owner
+    :return: ids of the tweets in the timeline
+    """
+    # getting ids of the latest tweets of the user and people he follows
+    following_query: Select = select(UserFollowerModel.user_id).where(
+        UserFollowerModel.follower_id == user_id
+    )
+    query: Select = (
+        select(TweetModel.id)
+        .where(
+            or_(
+                TweetModel.user_id == user_id,
+                TweetModel.user_id.in_(following_query),
+            )
+        )
+        .order_by(TweetModel.id.desc())
+        .limit(tweets_config.TIMELINE_MAX_LENGTH)
+    )
+    tweet_ids: list[int] = list((await session.scalars(query)).all())
+
+    # saving the timeline
+    key: str = TIMELINE_KEY.format(user_id)
+    members: dict[str, int] = {EMPTY_TIMELINE_MEMBER: 0}
+    members.update({str(i_id): i_id for i_id in tweet_ids})
+
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.delete(key)
+        pipe.zadd(key, members)
+        pipe.expire(key, tweets_config.TIMELINE_TTL)
+        await pipe.execute()
+
+    return tweet_ids
+
+
+async def _is_following_celebrity(session: AsyncSession, user_id: int) -> bool:
+    celebrity_ids: set[str] = await redis_client.smembers(CELEBRITIES_KEY)
+    if not celebrity_ids:
+        return False
+
+    query: Select = (
+        select(UserFollowerModel.id)
+        .where(UserFollowerModel.follower_id == user_id)
+        .where(UserFollowerModel.user_id.in_([int(i_id) for i_id in celebrity_ids]))
+        .limit(1)
+    )
+    return await session.scalar(query) is not None
+
+
+async def get_timeline(
+    session: AsyncSession,
+    user_id: int,
+    limit: int | None = None,
+    offset: int | None = None,
+    cursor: int | None = None,
+) -> list[int] | None:
+    """
+    The service for getting the page of the precomputed home timeline of the user.
+    The cold timeline is built for the next requests.
+    :param session: session to connect to the database
+    :param user_id: id of the timeline owner
+    :param limit: limiting the number of tweets to receive
+    :param offset: number of the page
+    :param cursor: id of the last tweet of the previous page
+    :return: ids of the tweets from the latest or None
+    if the timeline is cold or the user follows a celebrity
+    """
+    key: str = TIMELINE_KEY.format(user_id)
+
+    # getting only tweets older than the cursor, without the empty timeline member
+    max_score: str = f"({cursor}" if cursor else "+inf"
+    min_score: str = f"({EMPTY_TIMELINE_MEMBER}"
+    start: int | None = None
+    if limit:
+        start = (offset - 1) * limit if offset else 0
+
+    try:
+        # tweets of celebrities are not fanned out on write
+        if await _is_following_celebrity(session=session, user_id=user_id):
+            return None
+
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.exists(key)
+            pipe.zrevrangebyscore(key, max_score, min_score, start=start, num=limit)
+            exists, members = await pipe.execute()
+
+        if not exists:
+            await build_timeline(session=session, user_id=user_id)
+            return None
+
+        return [int(i_id) for i_id in members]
+    except RedisError as exc:
+        logger.warning(f"getting the timeline failed: {exc}")
+        return None
+
+
+async def push_tweet(session: AsyncSession, tweet_id: int, author_id: int) -> None:
+    """
+    The service for adding the new tweet to the timelines
+    of the author and his followers
+    :param session: session to connect to the database
+    :param tweet_id: id of the new tweet
+    :param author_id: id of the tweet author
+    :return: None
+    """
+    keys: list[str] = [TIMELINE_KEY.format(author_id)]
+    follower_ids: Sequence[int] = await get_follower_ids(
+        session=session, user_id=author_id
+    )
+
+    try:
+        if len(follower_ids) > tweets_config.TIMELINE_FANOUT_LIMIT:
+            await redis_client.sadd(CELEBRITIES_KEY, author_id)
+        else:
+            keys.extend(TIMELINE_KEY.format(i_id) for i_id in follower_ids)
+
+        for i_keys in _get_batches(keys):
+            await _PUSH_SCRIPT(
+                keys=i_keys, args=[tweets_config.TIMELINE_MAX_LENGTH, tweet_id]
+            )
+    except RedisError as exc:
+        logger.warning(f"pushing the tweet to timelines failed: {exc}")
+
+
+async def retract_tweet(session: AsyncSession, tweet_id: int, author_id: int) -> None:
+    """
+    The service for removing the deleted tweet from the timelines
+    of the author and his followers
+    :param session: session to connect to the database
+    :param tweet_id: id of the deleted tweet
+    :param author_id: id of the tweet author
+    :return: None
+    """
+    keys: list[str] = [TIMELINE_KEY.format(author_id)]
+    follower_ids: Sequence[int] = await get_follower_ids(
+        session=session, user_id=author_id
+    )
+    keys.extend(TIMELINE_KEY.format(i_id) for i_id in follower_ids)
+
+    try:
+        for i_keys in _get_batches(keys):
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for i_key in i_keys:
+                    pipe.zrem(i_key, tweet_id)
+                await pipe.execute()
+    except RedisError as exc:
+        logger.warning(f"retracting the tweet from timelines failed: {exc}")
+
+
+async def add_author_tweets(
+    session: AsyncSession, user_id: int, author_id: int
+) -> None:
+    """
+    The service for adding tweets of the followed author to the user timeline
+    :param session: session to connect to the database
+    :param user_id: id of the timeline owner
+    :param author_id: id of the followed author
+    :return: None
+    """
+    tweet_ids: Sequence[int] = await get_author_tweet_ids(
+        session=session, author_id=author_id
+    )
+    if not tweet_ids:
+        return
+
+    try:
+        await _PUSH_SCRIPT(
+            keys=[TIMELINE_KEY.format(user_id)],
+            args=[tweets_config.TIMELINE_MAX_LENGTH, *tweet_ids],
+        )
+    except RedisError as exc:
+        logger.warning(f"adding the author tweets to the timeline failed: {exc}")
+
+
+async def retract_author_tweets(
+    session: AsyncSession, user_id: int, author_id: int
+) -> None:
+    """
+    The service for removing tweets of the unfollowed author from the user timeline
+    :param session: session to connect to the database
+    :param user_id: id of the timeline owner
+    :param author_id: id of the unfollowed author
+    :return: None
+    """
+    tweet_ids: Sequence[int] = await get_author_tweet_ids(
+        session=session, author_id=author_id
+    )
+    if not tweet_ids:
+        return
+
+    try:
+        await redis_client.zrem(TIMELINE_KEY.format(user_id), *tweet_ids)
+    except RedisError as exc:
+        logger.warning(f"retracting the author tweets from the timeline failed: {exc}")
@@ -0,0 +1,127 @@
+import time
+from collections import OrderedDict
+
+from loguru import logger
+from prometheus_client import Counter
+from redis.exceptions import RedisError
+
+from src.redis_client import redis_client
+from src.users import config as users_config
+from src.users.schemas import UserPrincipalSchema
+
+PRINCIPAL_KEY: str = "principal:{}"
+# cached profiles of the user
+USER_TAG: str = "user:{}"
+
+principal_cache_requests: Counter = Counter(
+    "principal_cache_requests_total",
+    "Lookups of the user by api key hash in the principal cache",
+    ["tier", "result"],
+)
+
+
+class PrincipalMemoryCache:
+    """
+    LRU cache of users by api key hash with the lifetime of records
+    """
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self._max_size: int = max_size
+        self._ttl: int = ttl
+        self._records: OrderedDict[
+            str, tuple[float, UserPrincipalSchema]
+        ] = OrderedDict()
+
+    def get(self, api_key_hash: str) -> UserPrincipalSchema | None:
+        record: tuple[float, UserPrincipalSchema] | None = self._records.get(
+            api_key_hash
+        )
+        if record is None:
+            return None
+
+        expires_at, user = record
+        if expires_at < time.monotonic():
+            del self._records[api_key_hash]
+            return None
+
+        self._records.move_to_end(api_key_hash)
+        return user
+
+    def set(self, api_key_hash: str, user: UserPrincipalSchema) -> None:
+        self._records[api_key_hash] = (time.monotonic() + self._ttl, user)
+        self._records.move_to_end(api_key_hash)
+
+        if len(self._records) > self._max_size:
+            self._records.popitem(last=False)
+
+    def delete(self, api_key_hash: str) -> None:
+        self._records.pop(api_key_hash, None)
+
+    def clear(self) -> None:
+        self._records.clear()
+
+
+memory_cache: PrincipalMemoryCache = PrincipalMemoryCache(
+    max_size=users_config.PRINCIPAL_CACHE_SIZE,
+    ttl=users_config.PRINCIPAL_CACHE_TTL,
+)
+
+
+async def get_cached_principal(api_key_hash: str) -> UserPrincipalSchema | None:
+    """
+    getting the user from the memory cache or from redis
+    :param api_key_hash: hash of the user api key
+    :return: user principal or None if the user is not cached
+    """
+    user: UserPrincipalSchema | None = memory_cache.get(api_key_hash)
+    if user:
+        principal_cache_requests.labels(tier="memory", result="hit").inc()
+        return user
+    principal_cache_requests.labels(tier="memory", result="miss").inc()
+
+    try:
+        value: str | None = await redis_client.get(PRINCIPAL_KEY.format(api_key_hash))
+    except RedisError as exc:
+        logger.warning(f"getting the user from the cache failed: {exc}")
+        return None
+
+    if not value:
+        principal_cache_requests.labels(tier="redis", result="miss").inc()
+        return None
+    principal_cache_requests.labels(tier="redis", result="hit").inc()
+
+    user = UserPrincipalSchema.model_validate_json(value)
+    memory_cache.set(api_key_hash, user)
+    return user
+
+
+async def cache_principal(api_key_hash: str, user: UserPrincipalSchema) -> None:
+    """
+    saving the user to the memory cache and to redis
+    :param api_key_hash: hash of the user api key
+    :param user: user principal
+    :return: None
+    """
+    memory_cache.set(api_key_hash, user)
+    try:
+        await redis_client.set(
+            PRINCIPAL_KEY.format(api_key_hash),
+            user.model_dump_json(),
+            ex=users_config.PRINCIPAL_CACHE_REDIS_TTL,
+        )
+    except RedisError as exc:
+        logger.warning(f"saving the user to the cache failed: {exc}")
+
+
+async def invalidate_principal(api_key_hash: str) -> None:
+    """
+    removing the user from the memory cache and from redis.
+    memory caches of other processes expire after PRINCIPAL_CACHE_TTL.
+    :param api_key_hash: hash of the user api key
+    :return: None
+    """
+    memory_cache.delete(api_key_hash)
+    try:
+        await redis_client.delete(PRINCIPAL_KEY.format(api_key_hash))
+    except RedisError as exc:
+        logger.warning(f"removing the user from the cache failed: {exc}")
@@ -0,0 +1,12 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# the maximum number of users cached in the memory of one process
+PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", 10000))
+# lifetime of the user in the memory cache in seconds
+PRINCIPAL_CACHE_TTL: int = int(os.getenv("PRINCIPAL_CACHE_TTL", 60))
+# lifetime of the user in the redis cache in seconds
+PRINCIPAL_CACHE_REDIS_TTL: int = int(os.getenv("PRINCIPAL_CACHE_REDIS_TTL", 60 * 60))
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, MappedColumn, relationship
 
 from src.database.models import BaseModel
@@ -6,6 +6,7 @@ from src.database.models import BaseModel
 
 class UserModel(BaseModel):
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_api_key_hash", "api_key_hash"),)
     name: Mapped[str] = MappedColumn(String(length=50))
     api_key_hash: Mapped[str]
 
@@ -14,7 +15,7 @@ class UserModel(BaseModel):
         secondary="user_followers",
         primaryjoin="UserModel.id == UserFollowerModel.user_id",
         secondaryjoin="UserModel.id == UserFollowerModel.follower_id",
-        lazy="joined",
+        lazy="raise",
     )
 
     following: Mapped[list["UserModel"]] = relationship(
@@ -23,7 +24,7 @@ class UserModel(BaseModel):
         primaryjoin="UserModel.id == UserFollowerModel.follower_id",
         secondaryjoin="UserModel.id == UserFollowerModel.user_id",
         overlaps="followers",
-        lazy="joined",
+        lazy="raise",
     )
 
 
@@ -31,6 +32,7 @@ class UserFollowerModel(BaseModel):
     __tablename__ = "user_followers"
     __table_args__ = (
         UniqueConstraint("user_id", "follower_id", name="unique_follower_id"),
+        Index("ix_user_followers_follower_id_user_id", "follower_id", "user_id"),
     )
     user_id: Mapped[int] = MappedColumn(
         Integer(), ForeignKey("users.id", ondelete="CASCADE")
@@ -1,14 +1,15 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from fastapi.responses import JSONResponse
 from loguru import logger
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache import cache_response, get_cached_response, get_response_cache_key
 from src.database.core import get_session
 from src.exceptions import ConflictError, ExistError
 from src.schemas import SuccessResponseSchema
-from src.users.models import UserModel
-from src.users.schemas import SuccessResponseUserSchema
+from src.users.cache import USER_TAG
+from src.users.schemas import SuccessResponseUserSchema, UserPrincipalSchema
 from src.users.service import (
     check_and_get_user_by_api_key,
     follow_user,
@@ -32,19 +33,38 @@ router: APIRouter = APIRouter(
 @router.get("/me", response_model=SuccessResponseUserSchema, status_code=200)
 async def _get_my_profile(
     api_key: str = Depends(api_key_param), session: AsyncSession = Depends(get_session)
-) -> dict | JSONResponse:
+) -> Response | JSONResponse:
     """
     The endpoint for retrieving your own profile
     :param api_key: user api key who wants to retrieve the profile
     :return: the user profile
     """
     try:
+        logger.info("getting the user by api key")
+        await logger.complete()
+        user: UserPrincipalSchema = await check_and_get_user_by_api_key(
+            api_key=api_key, session=session
+        )
+
+        logger.info("getting the user own profile from the cache")
+        await logger.complete()
+        cache_key: str | None = await get_response_cache_key(
+            namespace="users:me", api_key=api_key, tags=[USER_TAG.format(user.id)]
+        )
+        cached_response: Response | None = await get_cached_response(cache_key)
+        if cached_response:
+            return cached_response
+
         logger.info("getting the user own profile")
         await logger.complete()
-        return {
-            "result": True,
-            "user": await get_me(session=session, api_key=api_key),
-        }
+        return await cache_response(
+            key=cache_key,
+            response_model=SuccessResponseUserSchema,
+            content={
+                "result": True,
+                "user": await get_me(session=session, api_key=api_key),
+            },
+        )
     except ExistError as exc:
         return await return_user_exception(exception=exc)
     except Exception as exc:
@@ -56,7 +76,7 @@ async def _get_user_profile(
     user_id: int,
     api_key: str = Depends(api_key_param),
     session: AsyncSession = Depends(get_session),
-) -> dict | JSONResponse:
+) -> Response | JSONResponse:
     """
     The endpoint for retrieving the user profile
     :param user_id: id of the user whose profile you want to get
@@ -72,12 +92,25 @@ async def _get_user_profile(
             error_message="The user who wants to retrieve the profile doesn't exist",
         )
 
+        logger.info("getting the user profile from the cache")
+        await logger.complete()
+        cache_key: str | None = await get_response_cache_key(
+            namespace="users", api_key=api_key, tags=[USER_TAG.format(user_id)]
+        )
+        cached_response: Response | None = await get_cached_response(cache_key)
+        if cached_response:
+            return cached_response
+
         logger.info("getting the user profile by another user")
         await logger.complete()
-        return {
-            "result": True,
-            "user": await get_user(session=session, user_id=user_id),
-        }
+        return await cache_response(
+            key=cache_key,
+            response_model=SuccessResponseUserSchema,
+            content={
+                "result": True,
+                "user": await get_user(session=session, user_id=user_id),
+            },
+        )
     except ExistError as exc:
         return await return_user_exception(exception=exc)
     except Exception as exc:
@@ -98,7 +131,7 @@ async def _follow(
     try:
         logger.info("getting the user who wants to follow")
         await logger.complete()
-        follower: UserModel = await check_and_get_user_by_api_key(
+        follower: UserPrincipalSchema = await check_and_get_user_by_api_key(
             api_key=api_key,
             session=session,
             error_message="The follower doesn't exist",
@@ -139,7 +172,7 @@ async def _unfollow(
     try:
         logger.info("getting the user who wants to unfollow")
         await logger.complete()
-        follower: UserModel = await check_and_get_user_by_api_key(
+        follower: UserPrincipalSchema = await check_and_get_user_by_api_key(
             api_key=api_key,
             session=session,
             error_message="The follower doesn't exist",
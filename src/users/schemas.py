@@ -13,6 +13,10 @@ class UserSchema(BaseModel):
         from_attributes = True
 
 
+class UserPrincipalSchema(UserSchema):
+    id: int
+
+
 class UserOutSchema(UserSchema):
     followers: list[UserSchema]
     following: list[UserSchema]
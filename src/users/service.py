@@ -1,9 +1,31 @@
-from sqlalchemy import Delete, Select, delete, select
+from typing import Sequence
+
+from sqlalchemy import (
+    Delete,
+    Row,
+    Select,
+    Update,
+    delete,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
+from sqlalchemy.sql.dml import ReturningDelete
 
+from src.cache import invalidate_cache
 from src.exceptions import ConflictError, ExistError
+from src.tweets.cache import FEED_TAG
+from src.tweets.timeline import add_author_tweets, retract_author_tweets
+from src.users.cache import (
+    USER_TAG,
+    cache_principal,
+    get_cached_principal,
+    invalidate_principal,
+)
 from src.users.models import UserFollowerModel, UserModel
+from src.users.schemas import UserPrincipalSchema
 from src.utils import get_hash
 
 
@@ -53,23 +75,41 @@ async def get_user(session: AsyncSession, user_id: int) -> UserModel:
     return user
 
 
-async def get_user_by_api_key(api_key: str, session: AsyncSession) -> UserModel:
+async def get_user_by_api_key(
+    api_key: str, session: AsyncSession
+) -> UserPrincipalSchema | None:
     """
     the service for getting user from the database by api key.
+    Only id and name are loaded, without followers and following.
     :param api_key: API key of the user.
     :param session: session to connect to the database.
-    :return: user model
+    :return: user principal or None if the user doesn't exist
     """
+    api_key_hash: str = get_hash(api_key)
+
+    # Getting user from cache
+    user: UserPrincipalSchema | None = await get_cached_principal(api_key_hash)
+    if user:
+        return user
+
     # Getting user
-    query: Select = select(UserModel).where(UserModel.api_key_hash == get_hash(api_key))
-    return await session.scalar(query)
+    query: Select = select(UserModel.id, UserModel.name).where(
+        UserModel.api_key_hash == api_key_hash
+    )
+    row: Row | None = (await session.execute(query)).first()
+    if not row:
+        return None
+
+    user = UserPrincipalSchema(id=row.id, name=row.name)
+    await cache_principal(api_key_hash, user)
+    return user
 
 
 async def check_and_get_user_by_api_key(
     api_key: str,
     session: AsyncSession,
     error_message: str = "The user doesn't exist",
-) -> UserModel:
+) -> UserPrincipalSchema:
     """
     the service for checking an existence of the user and
     getting user from the database by api key.
@@ -78,17 +118,95 @@ async def check_and_get_user_by_api_key(
     :param session: session to connect to the database.
     :param error_message: message that will be added to the exception
     if the user is not found
-    :return: user model
+    :return: user principal
     """
     # Getting user
-    user: UserModel = await get_user_by_api_key(api_key=api_key, session=session)
+    user: UserPrincipalSchema | None = await get_user_by_api_key(
+        api_key=api_key, session=session
+    )
     # Checking the existence of the user
     if not user:
         raise ExistError(error_message)
     return user
 
 
-async def follow_user(session: AsyncSession, user_id: int, follower: UserModel) -> None:
+async def update_api_key(session: AsyncSession, user_id: int, api_key: str) -> None:
+    """
+    The service for rotating API key of the user
+    :param session: session to connect to the database
+    :param user_id: id of the user
+    :param api_key: new API key of the user
+    :return: None
+    """
+    # Getting the old API key hash
+    query: Select = select(UserModel.api_key_hash).where(UserModel.id == user_id)
+    api_key_hash: str | None = await session.scalar(query)
+
+    # Checking the existence of a user
+    if not api_key_hash:
+        raise ExistError("The user doesn't exist")
+
+    # Updating API key hash
+    statement: Update = (
+        update(UserModel)
+        .where(UserModel.id == user_id)
+        .values(api_key_hash=get_hash(api_key))
+    )
+    await session.execute(statement)
+    await session.commit()
+
+    await invalidate_principal(api_key_hash)
+
+
+async def delete_user(session: AsyncSession, user_id: int) -> None:
+    """
+    The service for deleting the user
+    :param session: session to connect to the database
+    :param user_id: id of the user
+    :return: None
+    """
+    # Getting people connected with the user, their profiles will be changed
+    follows_query: Select = select(
+        UserFollowerModel.user_id, UserFollowerModel.follower_id
+    ).where(
+        or_(
+            UserFollowerModel.user_id == user_id,
+            UserFollowerModel.follower_id == user_id,
+        )
+    )
+    follows: Sequence[Row] = (await session.execute(follows_query)).all()
+
+    # Deleting user
+    statement: ReturningDelete = (
+        delete(UserModel)
+        .where(UserModel.id == user_id)
+        .returning(UserModel.api_key_hash)
+    )
+    api_key_hash: str | None = await session.scalar(statement)
+    await session.commit()
+
+    # Checking the existence of a user
+    if not api_key_hash:
+        raise ExistError("The user doesn't exist")
+
+    await invalidate_principal(api_key_hash)
+
+    # tweets of the user are removed from feeds of his followers
+    follower_ids: set[int] = {
+        i_follow.follower_id for i_follow in follows if i_follow.user_id == user_id
+    }
+    user_ids: set[int] = {user_id}
+    user_ids.update(i_follow.user_id for i_follow in follows)
+    user_ids.update(i_follow.follower_id for i_follow in follows)
+    await invalidate_cache(
+        *[USER_TAG.format(i_id) for i_id in user_ids],
+        *[FEED_TAG.format(i_id) for i_id in follower_ids],
+    )
+
+
+async def follow_user(
+    session: AsyncSession, user_id: int, follower: UserPrincipalSchema
+) -> None:
     """
     The service for following user
     :param session: session to connect to the database
@@ -101,11 +219,10 @@ async def follow_user(session: AsyncSession, user_id: int, follower: UserModel)
         raise ConflictError("The user can't follow himself.")
 
     # Getting user
-    user_query: Select = select(UserModel).where(UserModel.id == user_id)
-    user: UserModel = await session.scalar(user_query)
+    user_query: Select = select(UserModel.id).where(UserModel.id == user_id)
 
     # Checking the existence of a user
-    if not user:
+    if not await session.scalar(user_query):
         raise ExistError("The user doesn't exist")
 
     # Adding follow
@@ -116,9 +233,13 @@ async def follow_user(session: AsyncSession, user_id: int, follower: UserModel)
     session.add(instance)
     await session.commit()
 
+    # Adding tweets of the user to the follower timeline
+    await add_author_tweets(session=session, user_id=follower.id, author_id=user_id)
+    await _invalidate_follow(user_id=user_id, follower_id=follower.id)
+
 
 async def unfollow_user(
-    session: AsyncSession, user_id: int, follower: UserModel
+    session: AsyncSession, user_id: int, follower: UserPrincipalSchema
 ) -> None:
     """
     The service for unfollowing user
@@ -136,3 +257,16 @@ async def unfollow_user(
 
     await session.execute(statement)
     await session.commit()
+
+    # Removing tweets of the user from the follower timeline
+    await retract_author_tweets(session=session, user_id=follower.id, author_id=user_id)
+    await _invalidate_follow(user_id=user_id, follower_id=follower.id)
+
+
+async def _invalidate_follow(user_id: int, follower_id: int) -> None:
+    # followers and following of both users and the follower feed are changed
+    await invalidate_cache(
+        USER_TAG.format(user_id),
+        USER_TAG.format(follower_id),
+        FEED_TAG.format(follower_id),
+    )
@@ -1,3 +1,4 @@
+import base64
 import hashlib
 import random
 import string
@@ -5,8 +6,9 @@ import uuid
 from typing import Annotated
 
 from fastapi import Header
+from fastapi.responses import ORJSONResponse, Response
 from loguru import logger
-from starlette.responses import JSONResponse
+from pydantic import BaseModel
 
 from src.exceptions import APIException
 
@@ -33,18 +35,71 @@ def get_unique_filename(filetype: str | None = None) -> str:
     return get_random_string() + str(uuid.uuid4())
 
 
+def encode_cursor(value: int) -> str:
+    """
+    util for creating the opaque pagination cursor
+    :param value: id of the last record of the page
+    :return: cursor
+    """
+    return base64.urlsafe_b64encode(str(value).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    util for getting the value of the opaque pagination cursor
+    :param cursor: cursor from the previous page
+    :return: id of the last record of the previous page
+    """
+    try:
+        value: int = int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except ValueError:
+        raise ValueError("the cursor is invalid.")
+
+    if value <= 0:
+        raise ValueError("the cursor is invalid.")
+
+    return value
+
+
+def dump_trusted_response(response_model: type[BaseModel], content: dict) -> str:
+    """
+    util for serializing the response of the endpoint in one pass.
+    Content is validated by the response model once and dumped by pydantic-core,
+    without the second validation and jsonable_encoder of FastAPI.
+    :param response_model: response model of the endpoint
+    :param content: data of the response, it can contain ORM objects
+    :return: JSON of the response
+    """
+    return response_model.model_validate(content, from_attributes=True).model_dump_json(
+        by_alias=True
+    )
+
+
+def get_trusted_response(response_model: type[BaseModel], content: dict) -> Response:
+    """
+    util for getting the response serialized by dump_trusted_response
+    :param response_model: response model of the endpoint
+    :param content: data of the response, it can contain ORM objects
+    :return: response with JSON
+    """
+    return Response(
+        content=dump_trusted_response(response_model=response_model, content=content),
+        media_type="application/json",
+    )
+
+
 def api_key_param(api_key: Annotated[str, Header()]) -> str:
     return api_key
 
 
 async def return_user_exception(
     exception: APIException, status_code: int = 400, message: str = ""
-) -> JSONResponse:
+) -> ORJSONResponse:
     logger.info(
         f"error name: {exception.get_name()}, error message: {exception.get_message()}"
     )
     await logger.complete()
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content={
             "result": False,
@@ -59,7 +114,7 @@ async def return_custom_exception(
     message: str,
     status_code: int = 400,
     error_type: str = "",
-) -> JSONResponse:
+) -> ORJSONResponse:
     logger.info(
         f"string representation: {exception.__str__()}, "
         f"args: {str(exception.args)}, "
@@ -67,7 +122,7 @@ async def return_custom_exception(
     )
     await logger.complete()
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content={
             "result": False,
@@ -79,7 +134,7 @@ async def return_custom_exception(
 
 async def return_server_exception(
     exception: Exception, status_code: int = 500, message: str = ""
-) -> JSONResponse:
+) -> ORJSONResponse:
     logger.warning(
         f"string representation: {exception.__str__()}, args: {exception.args}"
     )
@@ -88,7 +143,7 @@ async def return_server_exception(
     if not message:
         message = "Oops, something went wrong :(\nTry again please"
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content={"result": False, "error_type": "Exception", "error_message": message},
     )
@@ -11,6 +11,8 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.pool import NullPool
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
 from httpx import AsyncClient
 
 from src.media.models import MediaModel
@@ -20,6 +22,7 @@ from src import config
 from src.database.core import get_session
 from src.database.models import BaseModel
 from src.main import application
+from src.redis_client import redis_client
 from src.users.models import UserModel
 
 engine_test: AsyncEngine = create_async_engine(url=config.DB_URL_TEST, poolclass=NullPool)
@@ -114,3 +117,12 @@ async def prepare_db() -> AsyncGenerator[None, None]:
     yield
     async with engine_test.begin() as connect:
         await connect.run_sync(BaseModel.metadata.drop_all)
+
+
+@pytest.fixture(autouse=True, scope="session")
+async def prepare_redis() -> AsyncGenerator[None, None]:
+    await redis_client.flushdb()
+    # the client doesn't run the startup event of the application
+    FastAPICache.init(RedisBackend(redis_client), prefix="fastapi-cache")
+    yield
+    await redis_client.flushdb()
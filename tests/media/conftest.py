@@ -1,8 +1,22 @@
+from pathlib import Path
+
 import aiofiles
 import pytest
 
+from src.media import config as media_config
+
 
 @pytest.fixture(scope="session")
 async def image_data() -> bytes:
     async with aiofiles.open("tests/media/test_image.jpg", "rb") as file:
         return await file.read()
+
+
+@pytest.fixture(autouse=True)
+def spool_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """
+    The fixture for saving uploaded files to the temporary spool directory
+    :return: path of the spool directory
+    """
+    monkeypatch.setattr(media_config, "MEDIA_SPOOL_PATH", str(tmp_path))
+    return tmp_path
@@ -1,8 +1,17 @@
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
 from httpx import AsyncClient
 from sqlalchemy import select, Select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from shared import TUsersTest
+from src.media import config as media_config
+from src.exceptions import SizeError
+from src.media import router as media_router
+from src.media.blobs import put_blob
 from src.media.models import MediaModel
 
 
@@ -90,3 +99,91 @@ async def test_adding_image_with_correct_data(
     assert media_record is not None
     assert type(media_record.src) is str
     assert len(media_record.src) > 0
+
+
+async def test_adding_image_sends_blob_reference_to_task(
+    async_client: AsyncClient,
+    users: TUsersTest,
+    image_data: bytes,
+    spool_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Test to checking that the image is saved to the spool
+    and only its reference is sent to the task.
+    :param async_client: client for requesting.
+    :param users: generated API keys for two users.
+    :param image_data: image bytes
+    :param spool_path: path of the spool directory
+    :return: None
+    """
+    task_kwargs: list[dict] = list()
+    monkeypatch.setattr(
+        media_router.load_image, "delay", lambda **kwargs: task_kwargs.append(kwargs)
+    )
+    monkeypatch.setattr(media_config, "MEDIA_CHUNK_SIZE", 1024)
+
+    response = await async_client.post(
+        "medias/",
+        headers={"Api-Key": users[0].api_key},
+        files={"file": image_data},
+    )
+
+    assert response.status_code == 201
+    assert task_kwargs == [
+        {
+            "image_id": response.json().get("media_id"),
+            "image_reference": task_kwargs[0]["image_reference"],
+        }
+    ]
+
+    store_name, blob_name = task_kwargs[0]["image_reference"].split(":")
+    assert store_name == "fs"
+    assert (spool_path / blob_name).read_bytes() == image_data
+
+
+async def test_adding_too_large_image(
+    async_client: AsyncClient,
+    users: TUsersTest,
+    image_data: bytes,
+    spool_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Test to checking the endpoint for adding the image larger than the limit.
+    :param async_client: client for requesting.
+    :param users: generated API keys for two users.
+    :param image_data: image bytes
+    :param spool_path: path of the spool directory
+    :return: None
+    """
+    monkeypatch.setattr(media_config, "MEDIA_MAX_SIZE", len(image_data) - 1)
+
+    response = await async_client.post(
+        "medias/",
+        headers={"Api-Key": users[0].api_key},
+        files={"file": image_data},
+    )
+
+    assert response.status_code == 413
+    assert response.json().get("result") is False
+    assert list(spool_path.iterdir()) == []
+
+
+async def test_spooling_image_of_unknown_size(
+    image_data: bytes, spool_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test to checking that the size limit is enforced while chunks are read
+    when the size of the file isn't known.
+    :param image_data: image bytes
+    :param spool_path: path of the spool directory
+    :return: None
+    """
+    monkeypatch.setattr(media_config, "MEDIA_MAX_SIZE", len(image_data) - 1)
+    monkeypatch.setattr(media_config, "MEDIA_CHUNK_SIZE", 1024)
+
+    with pytest.raises(SizeError):
+        await put_blob(file=UploadFile(file=BytesIO(image_data)))
+
+    assert list(spool_path.iterdir()) == []
@@ -0,0 +1,137 @@
+import os
+import time
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+
+from src.exceptions import SizeError
+from src.media import config as media_config
+from src.media.blobs import (
+    BLOB_PENDING_KEY,
+    BLOB_SIZES_KEY,
+    BLOB_STREAM_KEY,
+    acquire_blob_watcher,
+    delete_blob,
+    get_blob_store,
+    hand_off_blob,
+    open_blob,
+    put_blob,
+)
+from src.redis_client import redis_blob_client, redis_client
+
+
+@pytest.fixture
+def redis_blob_store(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    The fixture for saving uploaded files to Redis
+    :return: None
+    """
+    monkeypatch.setattr(media_config, "MEDIA_BLOB_STORE", "redis")
+    monkeypatch.setattr(media_config, "MEDIA_CHUNK_SIZE", 1024)
+
+
+async def test_redis_blob_store(
+    image_data: bytes, spool_path: Path, redis_blob_store: None
+) -> None:
+    """
+    Test to checking that the blob is saved to Redis by chunks with the lifetime,
+    read by the reference and deleted after consuming.
+    :param image_data: image bytes
+    :param spool_path: path of the spool directory
+    :param redis_blob_store: saving blobs to Redis
+    :return: None
+    """
+    reference: str = await put_blob(file=UploadFile(file=BytesIO(image_data)))
+
+    store_name, blob_name = reference.split(":")
+    key: str = BLOB_STREAM_KEY.format(blob_name)
+    assert store_name == "redis"
+    assert list(spool_path.iterdir()) == []
+    assert await redis_blob_client.xlen(key) == -(-len(image_data) // 1024)
+    assert 0 < await redis_blob_client.ttl(key) <= media_config.MEDIA_BLOB_TTL
+    assert await get_blob_store().clean() == (len(image_data), 1)
+
+    await hand_off_blob(reference)
+    assert await redis_blob_client.ttl(key) == -1
+
+    with await open_blob(reference) as blob_file:
+        assert blob_file.read() == image_data
+
+    await delete_blob(reference)
+
+    assert await redis_blob_client.exists(key) == 0
+    assert await redis_blob_client.hlen(BLOB_SIZES_KEY) == 0
+    with pytest.raises(FileNotFoundError):
+        await open_blob(reference)
+
+
+async def test_cleaning_expired_redis_blobs(
+    image_data: bytes, redis_blob_store: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test to checking that sizes of expired blobs aren't counted,
+    and the blob is deleted when the upload is too large.
+    :param image_data: image bytes
+    :param redis_blob_store: saving blobs to Redis
+    :param monkeypatch: patching the limit of the size
+    :return: None
+    """
+    reference: str = await put_blob(file=UploadFile(file=BytesIO(image_data)))
+    await redis_blob_client.delete(BLOB_STREAM_KEY.format(reference.split(":")[1]))
+
+    assert await get_blob_store().clean() == (0, 0)
+    assert await redis_blob_client.hlen(BLOB_SIZES_KEY) == 0
+
+    monkeypatch.setattr(media_config, "MEDIA_MAX_SIZE", len(image_data) - 1)
+    with pytest.raises(SizeError):
+        await put_blob(file=UploadFile(file=BytesIO(image_data)))
+
+    assert await redis_blob_client.keys(BLOB_STREAM_KEY.format("*")) == []
+
+
+async def test_cleaning_expired_file_blobs(
+    image_data: bytes, spool_path: Path
+) -> None:
+    """
+    Test to checking that expired files are deleted from the spool directory.
+    :param image_data: image bytes
+    :param spool_path: path of the spool directory
+    :return: None
+    """
+    references: list[str] = [
+        await put_blob(file=UploadFile(file=BytesIO(image_data))) for _ in range(2)
+    ]
+    expired_at: float = time.time() - media_config.MEDIA_BLOB_TTL - 1
+    os.utime(spool_path / references[0].split(":")[1], (expired_at, expired_at))
+
+    assert await get_blob_store().clean() == (len(image_data), 1)
+    assert [i_path.name for i_path in spool_path.iterdir()] == [
+        references[1].split(":")[1]
+    ]
+
+
+async def test_keeping_pending_blobs(
+    image_data: bytes, spool_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test to checking that expired blobs handed off to tasks aren't deleted,
+    and that only one worker of the application cleans the store.
+    :param image_data: image bytes
+    :param spool_path: path of the spool directory
+    :param monkeypatch: patching the lifetime of blobs
+    :return: None
+    """
+    monkeypatch.setattr(media_config, "MEDIA_BLOB_TTL", -1)
+    reference: str = await put_blob(file=UploadFile(file=BytesIO(image_data)))
+    await hand_off_blob(reference)
+
+    assert await get_blob_store().clean() == (len(image_data), 1)
+
+    await delete_blob(reference)
+
+    assert await redis_client.scard(BLOB_PENDING_KEY) == 0
+    assert await acquire_blob_watcher("first") is True
+    assert await acquire_blob_watcher("second") is False
+    assert await acquire_blob_watcher("first") is True
@@ -0,0 +1,101 @@
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.tweets.service import get_likes_preview
+from tests.shared import TUsersTest, TweetTestDataClass
+
+
+async def test_get_tweet_likes_with_wrong_tweet_id(
+    async_client: AsyncClient, users: TUsersTest
+) -> None:
+    """
+    Test for checking endpoint for getting likes of the tweet with wrong tweet id.
+    :param async_client: client for requesting.
+    :param users: generated users
+    :return: None
+    """
+    response = await async_client.get(
+        "tweets/0/likes",
+        headers={"Api-Key": users[0].api_key},
+    )
+
+    assert response.status_code == 400
+    assert response.json().get("result") is False
+
+
+async def test_get_tweet_likes_by_cursor(
+    async_client: AsyncClient,
+    tweets: list[TweetTestDataClass],
+    users: TUsersTest,
+) -> None:
+    """
+    Test for checking endpoint for getting likes of the tweet page by page.
+    :param async_client: client for requesting.
+    :param tweets: tweets which added in database
+    :param users: generated users
+    :return: None
+    """
+    # page #1, from the latest like
+    response = await async_client.get(
+        f"tweets/{tweets[13].id}/likes",
+        headers={"Api-Key": users[0].api_key},
+        params={"limit": 2},
+    )
+
+    assert response.status_code == 200
+    response_json: dict = response.json()
+    assert response_json.get("result") is True
+    assert response_json.get("likes") == [
+        {"user_id": users[2].id, "name": users[2].name},
+        {"user_id": users[1].id, "name": users[1].name},
+    ]
+
+    # page #2
+    response = await async_client.get(
+        f"tweets/{tweets[13].id}/likes",
+        headers={"Api-Key": users[0].api_key},
+        params={"limit": 2, "cursor": response_json.get("next_cursor")},
+    )
+
+    assert response.status_code == 200
+    response_json = response.json()
+    assert response_json.get("likes") == [
+        {"user_id": users[0].id, "name": users[0].name},
+    ]
+    assert response_json.get("next_cursor") is None
+
+
+async def test_feed_with_likes_preview(
+    async_client: AsyncClient,
+    async_session: AsyncSession,
+    tweets: list[TweetTestDataClass],
+    users: TUsersTest,
+) -> None:
+    """
+    Test for checking the number of likes and the latest likers in the feed.
+    :param async_client: client for requesting.
+    :param async_session: session for async connecting to the database.
+    :param tweets: tweets which added in database
+    :param users: generated users
+    :return: None
+    """
+    response = await async_client.get(
+        "tweets/",
+        headers={"Api-Key": users[0].api_key},
+    )
+
+    assert response.status_code == 200
+    response_tweets: dict[int, dict] = {
+        i_tweet.get("id"): i_tweet for i_tweet in response.json().get("tweets")
+    }
+    assert response_tweets[tweets[13].id].get("likes_count") == 3
+    assert len(response_tweets[tweets[13].id].get("likes")) == 3
+    assert response_tweets[tweets[0].id].get("likes_count") == 0
+    assert response_tweets[tweets[0].id].get("likes") == []
+
+    # the preview is limited by the size
+    likes_preview = await get_likes_preview(
+        session=async_session, tweet_ids=[tweets[13].id, tweets[16].id], size=1
+    )
+    assert [i_user.id for i_user in likes_preview[tweets[13].id]] == [users[2].id]
+    assert [i_user.id for i_user in likes_preview[tweets[16].id]] == [users[2].id]
@@ -1,6 +1,11 @@
+from typing import Any
+
 from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from shared import TweetTestDataClass, TUsersTest
+from src.tweets.service import get_tweets
 
 
 async def test_get_5_tweets_with_correct_data(
@@ -262,3 +267,225 @@ async def test_get_tweets_with_correct_data_page_2(
     assert users[0].id in author_ids
     assert users[1].id in author_ids
     assert users[2].id not in author_ids
+
+
+async def test_get_tweets_by_cursor(
+    tweets: list[TweetTestDataClass],
+    users: TUsersTest,
+    async_client: AsyncClient,
+) -> None:
+    """
+    Test for checking the endpoint for retrieving tweets with cursor pagination.
+    :param tweets: tweets which added in database
+    :param users: users who added in database
+    :param async_client: client for requesting.
+    :return: None
+    """
+    # page #1
+    response = await async_client.get(
+        "tweets/",
+        headers={"Api-Key": users[0].api_key},
+        params={"limit": 10},
+    )
+
+    assert response.status_code == 200
+
+    response_json: dict = response.json()
+    response_tweets_ids = [i_tweet.get("id") for i_tweet in response_json["tweets"]]
+    for i_index in [24, 23, 18, 16, 15, 14, 13, 12, 11, 10]:
+        assert tweets[i_index].id in response_tweets_ids
+
+    # page #2
+    response = await async_client.get(
+        "tweets/",
+        headers={"Api-Key": users[0].api_key},
+        params={"limit": 10, "cursor": response_json.get("next_cursor")},
+    )
+
+    assert response.status_code == 200
+
+    response_json = response.json()
+    response_tweets: list[dict] = response_json.get("tweets")
+    assert len(response_tweets) == 10
+
+    # checking tweets order by likes number
+    assert response_tweets[0].get("id") == tweets[5].id
+    assert response_tweets[1].get("id") == tweets[3].id
+
+    response_tweets_ids = [i_tweet.get("id") for i_tweet in response_tweets]
+    for i_index in [9, 8, 7, 6, 5, 4, 3, 2, 1, 0]:
+        assert tweets[i_index].id in response_tweets_ids
+
+    # page #3
+    response = await async_client.get(
+        "tweets/",
+        headers={"Api-Key": users[0].api_key},
+        params={"limit": 10, "cursor": response_json.get("next_cursor")},
+    )
+
+    assert response.status_code == 200
+    assert response.json().get("tweets") == []
+    assert response.json().get("next_cursor") is None
+
+
+async def test_get_tweets_with_invalid_cursor(
+    tweets: list[TweetTestDataClass],
+    users: TUsersTest,
+    async_client: AsyncClient,
+) -> None:
+    """
+    Test for checking the endpoint for retrieving tweets with invalid cursor.
+    :param tweets: tweets which added in database
+    :param users: users who added in database
+    :param async_client: client for requesting.
+    :return: None
+    """
+    response = await async_client.get(
+        "tweets/",
+        headers={"Api-Key": users[0].api_key},
+        params={"limit": 10, "cursor": "invalid"},
+    )
+
+    assert response.status_code == 400
+    assert response.json().get("result") is False
+
+
+async def test_get_tweets_with_cursor_and_offset(
+    tweets: list[TweetTestDataClass],
+    users: TUsersTest,
+    async_client: AsyncClient,
+) -> None:
+    """
+    Test for checking the endpoint for retrieving tweets with cursor and offset.
+    :param tweets: tweets which added in database
+    :param users: users who added in database
+    :param async_client: client for requesting.
+    :return: None
+    """
+    response = await async_client.get(
+        "tweets/",
+        headers={"Api-Key": users[0].api_key},
+        params={"limit": 10, "offset": 1, "cursor": "MTA="},
+    )
+
+    assert response.status_code == 400
+    assert response.json().get("result") is False
+
+
+async def test_get_tweets_without_joined_relations(
+    tweets: list[TweetTestDataClass],
+    users: TUsersTest,
+    async_session: AsyncSession,
+) -> None:
+    """
+    Test to check that author, likes preview and media of the page are loaded
+    by one query per relation instead of joins multiplying rows.
+    :param tweets: tweets which added in database
+    :param users: users who added in database
+    :param async_session: session for async connecting to the database.
+    :return: None
+    """
+    statements: list[str] = list()
+
+    def before_cursor_execute(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        statements.append(statement)
+
+    engine = async_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response_tweets = await get_tweets(
+            session=async_session, api_key=users[0].api_key, limit=10, offset=1
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert len(response_tweets) == 10
+    assert all("OUTER JOIN" not in i_statement for i_statement in statements)
+
+    # the tweets query and one query for every relation of the whole page
+    tweets_statements: list[str] = [
+        i_statement
+        for i_statement in statements
+        if "FROM tweets JOIN (SELECT" in i_statement
+    ]
+    assert len(tweets_statements) == 1
+    relation_statements: list[str] = [
+        i_statement
+        for i_statement in statements
+        if " IN ($" in i_statement and i_statement not in tweets_statements
+    ]
+    assert len(relation_statements) == 3
+    for i_table in ("FROM media", "FROM users", "JOIN LATERAL"):
+        assert any(i_table in i_statement for i_statement in relation_statements)
+
+
+async def test_get_tweets_from_cache(
+    tweets: list[TweetTestDataClass],
+    users: TUsersTest,
+    async_client: AsyncClient,
+    async_session: AsyncSession,
+) -> None:
+    """
+    Test for checking that the repeated page is got from the cache
+    and liking the tweet makes the cached page outdated.
+    :param tweets: tweets which added in database
+    :param users: users who added in database
+    :param async_client: client for requesting.
+    :param async_session: session for async connecting to the database.
+    :return: None
+    """
+    headers: dict = {"Api-Key": users[0].api_key}
+    params: dict = {"limit": 5, "offset": 1}
+    response = await async_client.get("tweets/", headers=headers, params=params)
+    assert response.status_code == 200
+
+    statements: list[str] = list()
+
+    def before_cursor_execute(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        statements.append(statement)
+
+    engine = async_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        cached_response = await async_client.get(
+            "tweets/", headers=headers, params=params
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert cached_response.status_code == 200
+    assert cached_response.json() == response.json()
+    assert statements == []
+
+    # liking the tweet of the page
+    tweet: dict = next(
+        i_tweet
+        for i_tweet in response.json().get("tweets")
+        if users[2].id not in [i_like.get("user_id") for i_like in i_tweet["likes"]]
+    )
+    response = await async_client.post(
+        f"tweets/{tweet.get('id')}/likes", headers={"Api-Key": users[2].api_key}
+    )
+    assert response.status_code == 201
+
+    response = await async_client.get("tweets/", headers=headers, params=params)
+    response_tweets: dict[int, dict] = {
+        i_tweet.get("id"): i_tweet for i_tweet in response.json().get("tweets")
+    }
+    assert response_tweets[tweet.get("id")].get("likes_count") == (
+        tweet.get("likes_count") + 1
+    )
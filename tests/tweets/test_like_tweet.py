@@ -1,8 +1,8 @@
 from httpx import AsyncClient
-from sqlalchemy import Select, select
+from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.tweets.models import TweetLikeModel
+from src.tweets.models import TweetLikeModel, TweetModel
 from tests.shared import TUsersTest, TweetTestDataClass
 
 
@@ -125,3 +125,25 @@ async def test_like_twice(
     )
     like_record: TweetLikeModel = await async_session.scalar(query)
     assert like_record is not None
+
+
+async def test_like_updates_likes_count(
+    async_session: AsyncSession,
+    tweet: TweetTestDataClass,
+) -> None:
+    """
+    Test for checking the number of likes of the tweet after liking.
+    :param async_session: session for async connecting to the database.
+    :param tweet: generated tweet
+    :return: None
+    """
+    likes_count_query: Select = select(TweetModel.likes_count).where(
+        TweetModel.id == tweet.id
+    )
+    likes_query: Select = select(func.count(TweetLikeModel.id)).where(
+        TweetLikeModel.tweet_id == tweet.id
+    )
+
+    likes_count: int = await async_session.scalar(likes_count_query)
+    assert likes_count > 0
+    assert likes_count == await async_session.scalar(likes_query)
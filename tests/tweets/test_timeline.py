@@ -0,0 +1,96 @@
+from httpx import AsyncClient
+
+from shared import TUsersTest
+from src.redis_client import redis_client
+from src.tweets.timeline import TIMELINE_KEY
+
+
+async def get_feed_ids(async_client: AsyncClient, api_key: str) -> list[int]:
+    response = await async_client.get("tweets/", headers={"Api-Key": api_key})
+    assert response.status_code == 200
+    return [i_tweet.get("id") for i_tweet in response.json().get("tweets")]
+
+
+async def get_timeline_ids(user_id: int) -> list[int]:
+    members: list[str] = await redis_client.zrange(TIMELINE_KEY.format(user_id), 0, -1)
+    return [int(i_id) for i_id in members]
+
+
+async def test_tweet_is_pushed_to_follower_timeline(
+    users: TUsersTest, async_client: AsyncClient
+) -> None:
+    """
+    Test for adding the new tweet to the warm timeline of the follower.
+    :param users: generated users
+    :param async_client: client for requesting.
+    :return: None
+    """
+    response = await async_client.post(
+        f"users/{users[0].id}/follow", headers={"Api-Key": users[1].api_key}
+    )
+    assert response.status_code == 201
+
+    # warming the follower timeline
+    await get_feed_ids(async_client=async_client, api_key=users[1].api_key)
+    assert await redis_client.exists(TIMELINE_KEY.format(users[1].id))
+
+    response = await async_client.post(
+        "tweets/",
+        headers={"Api-Key": users[0].api_key},
+        json={"tweet_data": "timeline tweet", "tweet_media_ids": []},
+    )
+    tweet_id: int = response.json().get("tweet_id")
+
+    assert tweet_id in await get_timeline_ids(user_id=users[1].id)
+    assert tweet_id in await get_feed_ids(
+        async_client=async_client, api_key=users[1].api_key
+    )
+
+
+async def test_deleted_tweet_is_retracted_from_timeline(
+    users: TUsersTest, async_client: AsyncClient
+) -> None:
+    """
+    Test for removing the deleted tweet from the timeline of the follower.
+    :param users: generated users
+    :param async_client: client for requesting.
+    :return: None
+    """
+    tweet_ids: list[int] = await get_timeline_ids(user_id=users[1].id)
+    response = await async_client.delete(
+        f"tweets/{tweet_ids[-1]}", headers={"Api-Key": users[0].api_key}
+    )
+    assert response.status_code == 200
+
+    assert tweet_ids[-1] not in await get_timeline_ids(user_id=users[1].id)
+    assert tweet_ids[-1] not in await get_feed_ids(
+        async_client=async_client, api_key=users[1].api_key
+    )
+
+
+async def test_unfollowed_author_tweets_are_retracted_from_timeline(
+    users: TUsersTest, async_client: AsyncClient
+) -> None:
+    """
+    Test for removing tweets of the unfollowed author from the timeline.
+    :param users: generated users
+    :param async_client: client for requesting.
+    :return: None
+    """
+    response = await async_client.post(
+        "tweets/",
+        headers={"Api-Key": users[0].api_key},
+        json={"tweet_data": "timeline tweet", "tweet_media_ids": []},
+    )
+    tweet_id: int = response.json().get("tweet_id")
+    assert tweet_id in await get_timeline_ids(user_id=users[1].id)
+
+    response = await async_client.delete(
+        f"users/{users[0].id}/follow", headers={"Api-Key": users[1].api_key}
+    )
+    assert response.status_code == 200
+
+    assert tweet_id not in await get_timeline_ids(user_id=users[1].id)
+    assert tweet_id not in await get_feed_ids(
+        async_client=async_client, api_key=users[1].api_key
+    )
@@ -2,7 +2,7 @@ from httpx import AsyncClient
 from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.tweets.models import TweetLikeModel
+from src.tweets.models import TweetLikeModel, TweetModel
 from tests.shared import TUsersTest, TweetTestDataClass
 
 
@@ -91,3 +91,33 @@ async def test_unlike_with_correct_data(
     )
     like_record: TweetLikeModel = await async_session.scalar(query)
     assert like_record is None
+
+
+async def test_unlike_updates_likes_count(
+    async_client: AsyncClient,
+    async_session: AsyncSession,
+    liked_tweet: TweetTestDataClass,
+    users: TUsersTest,
+) -> None:
+    """
+    Test for checking the number of likes of the tweet after unliking.
+    :param async_client: client for requesting.
+    :param async_session: session for async connecting to the database.
+    :param liked_tweet: generated tweet with like
+    :param users: generated users
+    :return: None
+    """
+    query: Select = select(TweetModel.likes_count).where(
+        TweetModel.id == liked_tweet.id
+    )
+    likes_count: int = await async_session.scalar(query)
+
+    response = await async_client.delete(
+        f"tweets/{liked_tweet.id}/likes",
+        headers={
+            "Api-Key": users[1].api_key
+        }
+    )
+
+    assert response.status_code == 200
+    assert await async_session.scalar(query) == likes_count - 1
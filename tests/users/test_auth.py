@@ -0,0 +1,158 @@
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.users.cache import invalidate_principal, memory_cache
+from src.users.models import UserFollowerModel
+from src.users.schemas import UserPrincipalSchema
+from src.users.service import delete_user, get_user_by_api_key, update_api_key
+from src.utils import get_hash, get_random_string
+from tests.shared import TUsersTest
+
+
+async def get_user_with_statements(
+    async_session: AsyncSession, api_key: str
+) -> tuple[UserPrincipalSchema | None, list[tuple[str, Any]]]:
+    """
+    Getting the user by api key and SQL statements executed by this.
+    :param async_session: session for async connecting to the database.
+    :param api_key: API key of the user
+    :return: user and statements with parameters
+    """
+    statements: list[tuple[str, Any]] = list()
+
+    def before_cursor_execute(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        statements.append((statement, parameters))
+
+    engine = async_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        user: UserPrincipalSchema | None = await get_user_by_api_key(
+            api_key=api_key, session=async_session
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return user, statements
+
+
+async def test_auth_with_one_query_and_one_row(
+    async_session: AsyncSession, followed_users: TUsersTest
+) -> None:
+    """
+    Test to check that getting the user by api key
+    doesn't load followers and following.
+    :param async_session: session for async connecting to the database.
+    :param followed_users: generated API keys for three users.
+    :return: None
+    """
+    # adding one more follower for the user
+    async_session.add(
+        UserFollowerModel(user_id=followed_users[0].id, follower_id=followed_users[2].id)
+    )
+    await async_session.commit()
+
+    await invalidate_principal(followed_users[0].api_key_hash)
+    user, statements = await get_user_with_statements(
+        async_session=async_session, api_key=followed_users[0].api_key
+    )
+
+    assert user is not None
+    assert user.id == followed_users[0].id
+    assert user.name == followed_users[0].name
+
+    # checking the number of queries
+    assert len(statements) == 1
+    statement, parameters = statements[0]
+    assert "JOIN" not in statement.upper()
+
+    # checking the number of rows
+    connection = await async_session.connection()
+    result = await connection.exec_driver_sql(statement, parameters)
+    assert len(result.fetchall()) == 1
+
+
+async def test_auth_from_cache_without_queries(
+    async_session: AsyncSession, followed_users: TUsersTest
+) -> None:
+    """
+    Test to check that the cached user is got without the database.
+    :param async_session: session for async connecting to the database.
+    :param followed_users: generated API keys for three users.
+    :return: None
+    """
+    await get_user_by_api_key(
+        api_key=followed_users[1].api_key, session=async_session
+    )
+
+    # from the memory cache
+    user, statements = await get_user_with_statements(
+        async_session=async_session, api_key=followed_users[1].api_key
+    )
+    assert user is not None
+    assert user.id == followed_users[1].id
+    assert len(statements) == 0
+
+    # from the redis cache
+    memory_cache.clear()
+    user, statements = await get_user_with_statements(
+        async_session=async_session, api_key=followed_users[1].api_key
+    )
+    assert user is not None
+    assert user.id == followed_users[1].id
+    assert len(statements) == 0
+
+
+async def test_auth_after_api_key_rotation(
+    async_session: AsyncSession, followed_users: TUsersTest
+) -> None:
+    """
+    Test to check that the old api key doesn't work after rotation.
+    :param async_session: session for async connecting to the database.
+    :param followed_users: generated API keys for three users.
+    :return: None
+    """
+    user = await get_user_by_api_key(
+        api_key=followed_users[2].api_key, session=async_session
+    )
+    assert user is not None
+
+    api_key: str = get_random_string()
+    await update_api_key(session=async_session, user_id=user.id, api_key=api_key)
+
+    assert await get_user_by_api_key(
+        api_key=followed_users[2].api_key, session=async_session
+    ) is None
+    assert await get_user_by_api_key(api_key=api_key, session=async_session) == user
+
+    followed_users[2].api_key = api_key
+    followed_users[2].api_key_hash = get_hash(api_key)
+
+
+async def test_auth_after_deleting_user(
+    async_session: AsyncSession, followed_users: TUsersTest
+) -> None:
+    """
+    Test to check that the deleted user isn't got from the cache.
+    :param async_session: session for async connecting to the database.
+    :param followed_users: generated API keys for three users.
+    :return: None
+    """
+    user = await get_user_by_api_key(
+        api_key=followed_users[2].api_key, session=async_session
+    )
+    assert user is not None
+
+    await delete_user(session=async_session, user_id=user.id)
+
+    assert await get_user_by_api_key(
+        api_key=followed_users[2].api_key, session=async_session
+    ) is None
@@ -65,3 +65,32 @@ async def test_get_my_profile_with_correct_data(
 
     assert followers[0].get("id") == followed_users[1].id
     assert followers[0].get("name") == followed_users[1].name
+
+
+async def test_get_my_profile_after_following(
+    async_client: AsyncClient, followed_users: TUsersTest
+) -> None:
+    """
+    Test for getting own user profile from the cache and after following.
+    :param async_client: client for requesting.
+    :param followed_users: generated API keys for two users.
+    :return: None
+    """
+    headers: dict = {"Api-Key": followed_users[0].api_key}
+    response = await async_client.get("users/me", headers=headers)
+    assert response.status_code == 200
+
+    # from the cache
+    cached_response = await async_client.get("users/me", headers=headers)
+    assert cached_response.status_code == 200
+    assert cached_response.json() == response.json()
+
+    response = await async_client.post(
+        f"users/{followed_users[2].id}/follow", headers=headers
+    )
+    assert response.status_code == 201
+
+    # the cached profile is outdated
+    response = await async_client.get("users/me", headers=headers)
+    following: list[dict] = response.json().get("user").get("following")
+    assert [i_user.get("id") for i_user in following] == [followed_users[2].id]